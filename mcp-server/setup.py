@@ -1,12 +1,13 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name="code-maat-mcp-server",
     version="0.1.0",
     description="Model Context Protocol server for Code Maat VCS analysis tool",
     author="Code Maat MCP Team",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    # The sources live in src/ but install as code_maat_mcp
+    packages=["code_maat_mcp", "code_maat_mcp.tools"],
+    package_dir={"code_maat_mcp": "src"},
     python_requires=">=3.8",
     install_requires=[
         "mcp>=1.0.0",
@@ -14,12 +15,27 @@ setup(
     extras_require={
         "dev": [
             "pytest>=8.0.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest-asyncio>=0.26.0",
+            "pytest-xdist>=3.0.0",
+            "pytest-benchmark>=4.0.0",
+            "jsonschema>=4.0.0",
+        ],
+        "jvm": [
+            "JPype1>=1.4.0",
+        ],
+        "fast": [
+            "pandas>=1.5.0",
+            "orjson>=3.9.0",
+            "uvloop>=0.17.0; platform_system != 'Windows' and python_version < '3.12'",
+        ],
+        "cache": [
+            "blake3>=0.3.0",
+            "zstandard>=0.21.0",
         ],
     },
     entry_points={
         "console_scripts": [
-            "code-maat-mcp-server=mcp_server:main",
+            "code-maat-mcp-server=code_maat_mcp.mcp_server:main",
         ],
     },
 )
\ No newline at end of file
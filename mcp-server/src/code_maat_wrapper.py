@@ -2,27 +2,156 @@
 Code Maat wrapper module for executing analysis via the standalone JAR.
 """
 
+import atexit
+import contextlib
+import functools
 import json
+import logging
+import mmap
 import os
+import queue
+import re
 import subprocess
 import tempfile
+import threading
 import csv
+import gzip
+import hashlib
 import io
+import itertools
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import IO, Callable, Dict, Iterator, List, Mapping, Optional, Any, Sequence, Tuple, Union
+from dataclasses import dataclass, replace
 
+try:
+    import jpype
+except ImportError:  # JPype is optional, see CodeMaatConfig.persistent_jvm
+    jpype = None
 
-@dataclass
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional, used to speed up CSV parsing
+    pd = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, used to speed up JSON I/O
+    orjson = None
+
+try:
+    import blake3
+except ImportError:  # blake3 is optional, used to hash logs for the disk cache
+    blake3 = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, used to compress the disk cache
+    zstandard = None
+
+
+logger = logging.getLogger(__name__)
+
+# Numeric cells, matched up front so that _convert_value never goes through
+# exception handling for text cells. They take the forms int() and float()
+# accept, such as "+1", "1e5", ".5" and "5.", but not nan or inf.
+_INT_RE = re.compile(r"[-+]?\d+")
+_FLOAT_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Each analysis is a short-lived JVM, so favour startup time over peak
+# throughput: stop JIT at C1 and skip the parallel GC setup. The heap is
+# sized per call from the log file unless the options set -Xmx themselves.
+DEFAULT_JAVA_OPTS = (
+    "-XX:+TieredCompilation",
+    "-XX:TieredStopAtLevel=1",
+    "-XX:+UseSerialGC",
+    "-Djava.awt.headless=true",
+    "-Xss512M"
+)
+MIN_HEAP_MB = 256
+MAX_HEAP_MB = 4096
+# Startup-over-throughput flags from DEFAULT_JAVA_OPTS, dropped for the JVMs
+# that outlive a single analysis (the JPype bridge and the --serve workers)
+_SHORT_RUN_OPTS = frozenset({"-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC"})
+
+# Analyses that are never cached: identity echoes every log entry back, so
+# its results are as large as the log and would crowd out the others
+_UNCACHED_ANALYSES = frozenset({"identity"})
+
+# Code Maat opens the log by file name, so a streamed log is handed to it as
+# its own stdin (POSIX only)
+_STDIN_LOG = "/dev/stdin"
+
+
+# Static descriptions served by get_analysis_info. They are read-only and
+# shared, so lookups hand out the same objects instead of rebuilding them.
+_ANALYSIS_INFO = MappingProxyType({
+    "authors": MappingProxyType({
+        "description": "Number of authors per module and revision count",
+        "output_columns": ("entity", "n-authors", "n-revs"),
+        "use_case": "Identify modules with high communication overhead"
+    }),
+    "coupling": MappingProxyType({
+        "description": "Logical coupling between modules that tend to change together",
+        "output_columns": ("entity", "coupled", "degree", "average-revs"),
+        "use_case": "Find hidden dependencies and refactoring candidates"
+    }),
+    "summary": MappingProxyType({
+        "description": "Overview statistics of the repository",
+        "output_columns": ("statistic", "value"),
+        "use_case": "Get high-level metrics about the codebase"
+    }),
+    "churn": MappingProxyType({
+        "description": "Code churn metrics showing change frequency",
+        "output_columns": ("entity", "added", "deleted"),
+        "use_case": "Identify unstable code areas"
+    }),
+    "age": MappingProxyType({
+        "description": "Code age showing how long since modules were last changed",
+        "output_columns": ("entity", "age-months"),
+        "use_case": "Find stable vs frequently changing code"
+    })
+})
+
+_DEFAULT_ANALYSIS_INFO = MappingProxyType({
+    "output_columns": ("varies",),
+    "use_case": "Refer to Code Maat documentation for details"
+})
+
+# Code Maat command line flags for the optional run_analysis keyword arguments
+_PARAM_FLAGS = MappingProxyType({
+    'rows': '-r',
+    'group': '-g',
+    'team_map_file': '-p',
+    'min_revs': '-n',
+    'min_shared_revs': '-m',
+    'min_coupling': '-i',
+    'max_coupling': '-x',
+    'max_changeset_size': '-s',
+    'expression_to_match': '-e',
+    'temporal_period': '-t',
+    'age_time_now': '-d',
+    'input_encoding': '--input-encoding'
+})
+
+
+@dataclass(frozen=True)
 class CodeMaatConfig:
     """Configuration for Code Maat execution."""
     jar_path: str
     java_executable: str = "java"
-    java_opts: List[str] = None
-    
-    def __post_init__(self):
-        if self.java_opts is None:
-            self.java_opts = ["-Xmx4g", "-Djava.awt.headless=true", "-Xss512M"]
+    java_opts: Tuple[str, ...] = DEFAULT_JAVA_OPTS
+    persistent_jvm: bool = False
+    worker_processes: int = 1
+    output_format: str = "csv"
+    cache_results: bool = True
+    max_cache_size: int = 64
+    disk_cache_dir: Optional[str] = None
+
+
+# Used when the config file is missing or invalid, and shared since it is frozen
+_DEFAULT_CONFIG = CodeMaatConfig(jar_path="../target/code-maat-1.0.5-SNAPSHOT-standalone.jar")
 
 
 class CodeMaatError(Exception):
@@ -30,21 +159,356 @@ class CodeMaatError(Exception):
     pass
 
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode JSON to UTF-8 bytes with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _split_csv_lines(lines: Iterator[str]) -> Iterator[List[str]]:
+    """Tokenize CSV lines, with a plain split for the common unquoted case.
+    
+    Code Maat only quotes cells that contain separators, so most lines are
+    split on commas directly. From the first quote on, the rest of the input
+    goes through the csv module, which also handles quoted line breaks.
+    """
+    for line in lines:
+        if '"' in line:
+            yield from csv.reader(itertools.chain([line], lines))
+            return
+        line = line.rstrip('\r\n')
+        if line:
+            yield line.split(',')
+
+
+@functools.lru_cache(maxsize=32)
+def _log_digest(log_file: str, mtime_ns: int, size: int) -> str:
+    """Hash the contents of a log file for the disk cache.
+    
+    mtime and size are only part of the memoization key, so a changed
+    log is hashed again. The file is mapped rather than read into memory.
+    """
+    hasher = blake3.blake3() if blake3 is not None else hashlib.blake2b()
+    if size:
+        with open(log_file, 'rb') as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_jar(jar_path: str, base_dir: str,
+                 path_exists: Optional[Callable[[str], bool]] = None) -> str:
+    """Resolve and check the Code Maat JAR once per process.
+    
+    A missing JAR raises, and since lru_cache does not cache exceptions
+    the check is retried until the JAR shows up. path_exists replaces the
+    os.access check, e.g. for a JAR that is not built yet.
+    """
+    path = Path(jar_path)
+    if not path.is_absolute():
+        path = (Path(base_dir) / path).resolve()
+    
+    exists = path_exists(str(path)) if path_exists is not None else os.access(path, os.F_OK)
+    if not exists:
+        raise CodeMaatError(f"Code Maat JAR not found at: {path}")
+    
+    return str(path)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(config_path: str, mtime_ns: int, size: int) -> CodeMaatConfig:
+    """Parse a config file once per process.
+    
+    mtime and size are only part of the memoization key, so an edited
+    file is parsed again. The returned config is frozen and can be shared.
+    """
+    config_data = _json_loads(Path(config_path).read_bytes())
+    code_maat_config = config_data.get("code_maat", {})
+    server_config = config_data.get("server", {})
+    
+    return CodeMaatConfig(
+        jar_path=code_maat_config.get("jar_path", _DEFAULT_CONFIG.jar_path),
+        java_executable=code_maat_config.get("java_executable", "java"),
+        java_opts=tuple(code_maat_config.get("java_opts", DEFAULT_JAVA_OPTS)),
+        persistent_jvm=code_maat_config.get("persistent_jvm", False),
+        worker_processes=code_maat_config.get("worker_processes", 1),
+        output_format=code_maat_config.get("output_format", "csv"),
+        cache_results=server_config.get("cache_results", True),
+        max_cache_size=server_config.get("max_cache_size", 64),
+        disk_cache_dir=server_config.get("disk_cache_dir")
+    )
+
+
+def _start_process(cmd: Sequence[str], program: str, **kwargs) -> subprocess.Popen:
+    """Start a child process, reporting e.g. a missing executable as CodeMaatError.
+    
+    Python's own fds are non-inheritable (PEP 446), so close_fds=False is
+    safe and lets CPython spawn via posix_spawn instead of walking every fd.
+    """
+    try:
+        return subprocess.Popen(cmd, close_fds=False, **kwargs)
+    except OSError as e:
+        raise CodeMaatError(f"Cannot run {program}: {e}")
+
+
+def _persistent_java_opts(java_opts: Tuple[str, ...]) -> List[str]:
+    """JVM options for a long-lived JVM, which serves logs of any size.
+    
+    The short-run tuning is left out so the JIT reaches C2 and the default
+    GC is used, and the heap gets the largest size unless set explicitly.
+    """
+    opts = [opt for opt in java_opts if opt not in _SHORT_RUN_OPTS]
+    if not any(opt.startswith("-Xmx") for opt in opts):
+        opts.append(f"-Xmx{MAX_HEAP_MB}m")
+    return opts
+
+
+class JvmBridge:
+    """
+    Long-lived, in-process JVM hosting Code Maat through JPype.
+    
+    The JVM is started once per process and the Code Maat namespaces are
+    loaded on first use, so each analysis only pays for the analysis itself
+    instead of JVM startup and JAR classloading.
+    """
+    
+    _instance: Optional["JvmBridge"] = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, config: CodeMaatConfig):
+        if not jpype.isJVMStarted():
+            jpype.startJVM(
+                jpype.getDefaultJVMPath(),
+                *_persistent_java_opts(config.java_opts),
+                classpath=[config.jar_path]
+            )
+            atexit.register(jpype.shutdownJVM)
+        
+        clojure = jpype.JClass("clojure.java.api.Clojure")
+        clojure.var("clojure.core", "require").invoke(clojure.read("code-maat.cmd-line"))
+        
+        self._keyword = lambda name: clojure.read(f":{name}")
+        self._hash_map = clojure.var("clojure.core", "hash-map")
+        self._push_bindings = clojure.var("clojure.core", "push-thread-bindings")
+        self._pop_bindings = clojure.var("clojure.core", "pop-thread-bindings")
+        self._out = clojure.var("clojure.core", "*out*")
+        self._parse_opts = clojure.var("clojure.tools.cli", "parse-opts")
+        self._cli_options = clojure.var("code-maat.cmd-line", "cli-options").deref()
+        self._run = clojure.var("code-maat.app.app", "run")
+    
+    @classmethod
+    def instance(cls, config: CodeMaatConfig) -> "JvmBridge":
+        """Return the process-wide bridge, starting the JVM on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(config)
+            return cls._instance
+    
+    def run(self, argv: List[str]) -> str:
+        """
+        Run Code Maat with the given command line arguments.
+        
+        The Clojure `-main` calls System/exit on errors, which would take the
+        hosting Python process down with it. Instead we parse the options with
+        Code Maat's own CLI spec and call the app entry point directly, binding
+        *out* to a buffer so the CSV result can be returned.
+        """
+        parsed = self._parse_opts.invoke(jpype.java.util.Arrays.asList(argv), self._cli_options)
+        errors = parsed.valAt(self._keyword("errors"))
+        if errors is not None:
+            raise CodeMaatError(f"Invalid Code Maat arguments: {errors}")
+        options = parsed.valAt(self._keyword("options"))
+        
+        output = jpype.JClass("java.io.StringWriter")()
+        self._push_bindings.invoke(self._hash_map.invoke(self._out, output))
+        try:
+            self._run.invoke(options.valAt(self._keyword("log")), options)
+        except jpype.JException as e:
+            raise CodeMaatError(f"Code Maat execution failed: {e.getMessage()}")
+        finally:
+            self._pop_bindings.invoke()
+        
+        return str(output.toString())
+
+
+class CodeMaatWorker:
+    """
+    Long-running Code Maat process answering requests over stdin/stdout.
+    
+    Used for persistent_jvm when JPype is not installed. The worker runs
+    Code Maat's --serve loop: each request is one JSON line with the
+    command line arguments of a run, and each response is one JSON line
+    with the output that run would have printed. Requests are serialized
+    and a worker that died is restarted on the next request.
+    """
+    
+    def __init__(self, cmd: Sequence[str], timeout: float):
+        self._cmd = list(cmd)
+        self._timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+    
+    def start(self):
+        """Start the worker process unless it is already running."""
+        with self._lock:
+            self._ensure_running()
+    
+    def close(self):
+        """Stop the worker process; closing stdin ends its serve loop."""
+        with self._lock:
+            self._stop()
+    
+    def run(self, argv: Sequence[str]) -> str:
+        """Run Code Maat with the given command line arguments and return its output."""
+        request = _json_dumps({"args": list(argv)}) + b"\n"
+        
+        with self._lock:
+            # A worker that died since the last request gets one restart
+            for _ in range(2):
+                proc = self._ensure_running()
+                line, timed_out = self._exchange(proc, request)
+                if timed_out:
+                    self._stop()
+                    raise CodeMaatError("Code Maat execution timed out")
+                if line:
+                    break
+                self._stop()
+            else:
+                raise CodeMaatError("Code Maat worker exited unexpectedly")
+        
+        try:
+            response = _json_loads(line)
+        except ValueError:
+            raise CodeMaatError(
+                f"Invalid response from Code Maat worker (does the JAR support --serve?): "
+                f"{line.decode('utf-8', 'replace').strip()}"
+            )
+        if not response.get("ok"):
+            raise CodeMaatError(f"Code Maat execution failed: {response.get('error')}")
+        return response["output"]
+    
+    def _exchange(self, proc: subprocess.Popen, request: bytes):
+        """Send one request and read the response line, or b"" if the worker is gone."""
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+        
+        watchdog = threading.Timer(self._timeout, kill_on_timeout)
+        watchdog.start()
+        try:
+            proc.stdin.write(request)
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except OSError:  # broken pipe to a dead worker
+            line = b""
+        finally:
+            watchdog.cancel()
+        return line, timed_out.is_set()
+    
+    def _ensure_running(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._stop()
+            self._proc = subprocess.Popen(
+                self._cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                close_fds=False
+            )
+        return self._proc
+    
+    def _stop(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
+
 class CodeMaatWrapper:
     """Wrapper for executing Code Maat analyses."""
     
-    SUPPORTED_VCS = {"git", "git2", "svn", "hg", "p4", "tfs"}
-    SUPPORTED_ANALYSES = {
+    SUPPORTED_VCS = frozenset({"git", "git2", "svn", "hg", "p4", "tfs"})
+    SUPPORTED_ANALYSES = frozenset({
         "authors", "revisions", "coupling", "soc", "summary", "identity",
         "abs-churn", "author-churn", "entity-churn", "entity-ownership",
         "main-dev", "refactoring-main-dev", "entity-effort", "main-dev-by-revs",
         "fragmentation", "communication", "messages", "age"
-    }
+    })
+    _SUPPORTED_VCS_STR = ", ".join(sorted(SUPPORTED_VCS))
+    _SUPPORTED_ANALYSES_STR = ", ".join(sorted(SUPPORTED_ANALYSES))
+    ANALYSIS_TIMEOUT = 300  # seconds
     
-    def __init__(self, config_path: Optional[str] = None):
-        """Initialize the wrapper with configuration."""
+    def __init__(self, config_path: Optional[str] = None,
+                 path_exists: Optional[Callable[[str], bool]] = None):
+        """Initialize the wrapper with configuration.
+        
+        path_exists, if given, is used instead of the filesystem to check
+        that the configured JAR exists.
+        """
         self.config = self._load_config(config_path)
-        self._validate_config()
+        self._validate_config(path_exists)
+        # The config is frozen, so the JVM part of the command never changes
+        self._java_cmd = (self.config.java_executable, *self.config.java_opts)
+        self._jar_args = ("-jar", self.config.jar_path)
+        self._cache: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        self._idle_workers: "queue.Queue[CodeMaatWorker]" = queue.Queue()
+        self._worker_count = 0
+        self._worker_lock = threading.Lock()
+    
+    def warm_up(self):
+        """Start a JVM ahead of the first analysis.
+        
+        With a persistent JVM this boots the in-process bridge. Otherwise a
+        throwaway help run pulls the JVM and the JAR into the OS page cache.
+        Failures are only logged, the first analysis reports real errors.
+        """
+        try:
+            if self.config.persistent_jvm:
+                self.start_persistent_jvm()
+            else:
+                subprocess.run(
+                    [*self._java_cmd, *self._jar_args, "-h"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=60,
+                    close_fds=False
+                )
+        except Exception as e:
+            logger.warning(f"Code Maat warmup failed: {e}")
+    
+    def start_persistent_jvm(self):
+        """Start the persistent JVM now instead of on the first analysis.
+        
+        Boots the in-process bridge, or a worker process without JPype, and
+        raises if that fails. Does nothing unless persistent_jvm is set.
+        """
+        if not self.config.persistent_jvm:
+            return
+        if jpype is not None:
+            JvmBridge.instance(self.config)
+        else:
+            with self._checkout_worker() as worker:
+                worker.start()
     
     def _load_config(self, config_path: Optional[str] = None) -> CodeMaatConfig:
         """Load configuration from file or use defaults."""
@@ -52,182 +516,505 @@ class CodeMaatWrapper:
             config_path = os.path.join(os.path.dirname(__file__), "..", "mcp_config.json")
         
         try:
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-                code_maat_config = config_data.get("code_maat", {})
-                
-                return CodeMaatConfig(
-                    jar_path=code_maat_config.get("jar_path", "../target/code-maat-1.0.5-SNAPSHOT-standalone.jar"),
-                    java_executable=code_maat_config.get("java_executable", "java"),
-                    java_opts=code_maat_config.get("java_opts", ["-Xmx4g", "-Djava.awt.headless=true", "-Xss512M"])
-                )
+            stat = os.stat(config_path)
+            return _load_config_file(config_path, stat.st_mtime_ns, stat.st_size)
         except (FileNotFoundError, json.JSONDecodeError):
             # Use defaults if config file not found or invalid
-            return CodeMaatConfig(
-                jar_path="../target/code-maat-1.0.5-SNAPSHOT-standalone.jar"
-            )
+            return _DEFAULT_CONFIG
     
-    def _validate_config(self):
+    def _validate_config(self, path_exists: Optional[Callable[[str], bool]] = None):
         """Validate that Code Maat JAR exists and is accessible."""
-        jar_path = Path(self.config.jar_path)
-        if not jar_path.is_absolute():
-            # Resolve relative to the mcp-server directory
-            base_dir = Path(__file__).parent.parent
-            jar_path = (base_dir / jar_path).resolve()
-        
-        if not jar_path.exists():
-            raise CodeMaatError(f"Code Maat JAR not found at: {jar_path}")
-        
-        self.config.jar_path = str(jar_path)
+        # Resolve relative paths against the mcp-server directory
+        base_dir = str(Path(__file__).parent.parent)
+        jar_path = _resolve_jar(self.config.jar_path, base_dir, path_exists)
+        self.config = replace(self.config, jar_path=jar_path)
     
-    def validate_inputs(self, log_file: str, vcs: str, analysis: str) -> bool:
-        """Validate input parameters."""
-        if not os.path.exists(log_file):
+    def validate_inputs(self, log_file: Optional[str], vcs: str, analysis: str) -> bool:
+        """Validate input parameters; a streamed log passes log_file=None."""
+        try:
+            if log_file is not None:
+                os.stat(log_file)
+        except FileNotFoundError:
             raise CodeMaatError(f"Log file not found: {log_file}")
         
         if vcs not in self.SUPPORTED_VCS:
-            raise CodeMaatError(f"Unsupported VCS: {vcs}. Supported: {', '.join(self.SUPPORTED_VCS)}")
+            raise CodeMaatError(f"Unsupported VCS: {vcs}. Supported: {self._SUPPORTED_VCS_STR}")
         
         if analysis not in self.SUPPORTED_ANALYSES:
-            raise CodeMaatError(f"Unsupported analysis: {analysis}. Supported: {', '.join(self.SUPPORTED_ANALYSES)}")
+            raise CodeMaatError(f"Unsupported analysis: {analysis}. Supported: {self._SUPPORTED_ANALYSES_STR}")
         
         return True
     
     def run_analysis(self, 
-                    log_file: str,
+                    log_file: Optional[str],
                     vcs: str,
                     analysis: str,
+                    use_cache: bool = True,
+                    log_stream: Optional[IO[bytes]] = None,
                     **kwargs) -> List[Dict[str, Any]]:
         """
         Run a Code Maat analysis and return structured results.
         
         Args:
-            log_file: Path to the VCS log file
+            log_file: Path to the VCS log file, or None with log_stream
             vcs: VCS type (git, git2, svn, hg, p4, tfs)
             analysis: Analysis type
+            use_cache: Whether cached results may be returned; when False
+                Code Maat runs again and its results replace the cached ones
+            log_stream: Binary stream with a file descriptor, such as the
+                stdout of generate_git_log(stream=True), read instead of log_file
             **kwargs: Additional Code Maat options
         
         Returns:
             List of dictionaries containing analysis results
+        
+        Results are cached per log file state (mtime and size) and arguments,
+        so repeating an analysis on an unchanged log skips Code Maat entirely.
+        With disk_cache_dir set they are also kept on disk, keyed by the log
+        contents, so the cache survives server restarts.
+        
+        A log_stream becomes Code Maat's stdin and is never cached; it always
+        runs in a new Code Maat process, even with persistent_jvm set. The
+        identity analysis is not cached either, in memory or on disk.
         """
+        if log_stream is not None:
+            self.validate_inputs(None, vcs, analysis)
+            return self._execute_analysis(None, vcs, analysis, kwargs, log_stream)
+        
         self.validate_inputs(log_file, vcs, analysis)
         
-        # Build command
-        cmd = [
-            self.config.java_executable,
-            *self.config.java_opts,
-            "-jar", self.config.jar_path,
-            "-l", log_file,
+        if analysis in _UNCACHED_ANALYSES:
+            return self._execute_analysis(log_file, vcs, analysis, kwargs)
+        
+        if not self.config.cache_results:
+            return self._execute_with_disk_cache(log_file, vcs, analysis, kwargs, use_cache)
+        
+        key = self._cache_key(log_file, vcs, analysis, kwargs)
+        if use_cache:
+            with self._cache_lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    return self._cache[key]
+        
+        results = self._execute_with_disk_cache(log_file, vcs, analysis, kwargs, use_cache)
+        
+        with self._cache_lock:
+            self._cache[key] = results
+            while len(self._cache) > self.config.max_cache_size:
+                self._cache.popitem(last=False)
+        
+        return results
+    
+    def run_analysis_bundle(self,
+                            log_file: str,
+                            vcs: str,
+                            analyses: Sequence[str],
+                            use_cache: bool = True,
+                            **kwargs) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run several Code Maat analyses on a single parse of the log file.
+        
+        Args:
+            log_file: Path to the VCS log file
+            vcs: VCS type (git, git2, svn, hg, p4, tfs)
+            analyses: Analysis types to run
+            use_cache: Whether cached results may be returned, as in run_analysis
+            **kwargs: Additional Code Maat options, shared by all analyses
+        
+        Returns:
+            Dictionary mapping each analysis type to its results
+        
+        All analyses that are not already cached run in one Code Maat
+        invocation, so the JVM starts and the log is parsed only once.
+        """
+        if not analyses:
+            raise CodeMaatError("No analyses requested")
+        for analysis in analyses:
+            self.validate_inputs(log_file, vcs, analysis)
+        
+        results = {}
+        if self.config.cache_results and use_cache:
+            with self._cache_lock:
+                for analysis in analyses:
+                    key = self._cache_key(log_file, vcs, analysis, kwargs)
+                    if key in self._cache:
+                        self._cache.move_to_end(key)
+                        results[analysis] = self._cache[key]
+        
+        missing = [analysis for analysis in dict.fromkeys(analyses) if analysis not in results]
+        if missing:
+            cache_paths = {
+                analysis: self._disk_cache_path(log_file, vcs, analysis, kwargs)
+                for analysis in missing
+            }
+            to_run = []
+            for analysis in missing:
+                cached = self._read_disk_cache(cache_paths[analysis]) if use_cache else None
+                if cached is None:
+                    to_run.append(analysis)
+                else:
+                    results[analysis] = cached
+            
+            if to_run:
+                args = ["-l", log_file, "-c", vcs, "-A", ",".join(to_run)]
+                self._add_optional_params(args, kwargs)
+                bundle = self._run_code_maat(log_file, args, "json") or {}
+                
+                for analysis in to_run:
+                    results[analysis] = bundle.get(analysis, [])
+                    self._write_disk_cache(cache_paths[analysis], results[analysis])
+            
+            if self.config.cache_results:
+                with self._cache_lock:
+                    for analysis in missing:
+                        key = self._cache_key(log_file, vcs, analysis, kwargs)
+                        self._cache[key] = results[analysis]
+                    while len(self._cache) > self.config.max_cache_size:
+                        self._cache.popitem(last=False)
+        
+        return {analysis: results[analysis] for analysis in analyses}
+    
+    def _execute_with_disk_cache(self,
+                                 log_file: str,
+                                 vcs: str,
+                                 analysis: str,
+                                 kwargs: Dict[str, Any],
+                                 use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Serve an analysis from the disk cache, running Code Maat on a miss."""
+        path = self._disk_cache_path(log_file, vcs, analysis, kwargs)
+        results = self._read_disk_cache(path) if use_cache else None
+        if results is None:
+            results = self._execute_analysis(log_file, vcs, analysis, kwargs)
+            self._write_disk_cache(path, results)
+        return results
+    
+    def _disk_cache_path(self,
+                         log_file: str,
+                         vcs: str,
+                         analysis: str,
+                         kwargs: Dict[str, Any]) -> Optional[Path]:
+        """Locate the disk cache entry of an analysis, or None when disabled."""
+        if not self.config.disk_cache_dir:
+            return None
+        
+        stat = os.stat(log_file)
+        log_digest = _log_digest(os.path.abspath(log_file), stat.st_mtime_ns, stat.st_size)
+        # hash() is salted per process, so the arguments need a stable digest
+        args = json.dumps([vcs, sorted(kwargs.items())], default=str)
+        args_digest = hashlib.blake2b(args.encode("utf-8"), digest_size=8).hexdigest()
+        suffix = ".json.zst" if zstandard is not None else ".json.gz"
+        
+        cache_dir = Path(os.path.expanduser(self.config.disk_cache_dir))
+        return cache_dir / f"{log_digest}-{analysis}-{args_digest}{suffix}"
+    
+    def _read_disk_cache(self, path: Optional[Path]) -> Optional[List[Dict[str, Any]]]:
+        """Load cached results from disk; unreadable entries count as misses."""
+        if path is None:
+            return None
+        
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Cannot read disk cache entry {path}: {e}")
+            return None
+        
+        try:
+            if zstandard is not None:
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = gzip.decompress(data)
+            return _json_loads(data)
+        except Exception as e:
+            logger.warning(f"Ignoring corrupt disk cache entry {path}: {e}")
+            return None
+    
+    def _write_disk_cache(self, path: Optional[Path], results: List[Dict[str, Any]]):
+        """Store results on disk; failing to do so never fails the analysis."""
+        if path is None:
+            return
+        
+        data = _json_dumps(results)
+        if zstandard is not None:
+            data = zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            data = gzip.compress(data, compresslevel=6)
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write next to the entry and rename, so readers never see half a file
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                f.write(data)
+            os.replace(f.name, path)
+        except OSError as e:
+            logger.warning(f"Cannot write disk cache entry {path}: {e}")
+    
+    def _cache_key(self, log_file: str, vcs: str, analysis: str, kwargs: Dict[str, Any]) -> tuple:
+        """Build a result cache key that changes whenever the log file does."""
+        stat = os.stat(log_file)
+        return (
+            os.path.abspath(log_file), stat.st_mtime_ns, stat.st_size,
+            vcs, analysis, tuple(sorted(kwargs.items()))
+        )
+    
+    def _execute_analysis(self,
+                          log_file: Optional[str],
+                          vcs: str,
+                          analysis: str,
+                          kwargs: Dict[str, Any],
+                          log_stream: Optional[IO[bytes]] = None) -> List[Dict[str, Any]]:
+        """Invoke Code Maat and parse its output."""
+        # Build Code Maat arguments
+        args = [
+            "-l", _STDIN_LOG if log_stream is not None else log_file,
             "-c", vcs,
             "-a", analysis
         ]
         
         # Add optional parameters
-        self._add_optional_params(cmd, kwargs)
+        self._add_optional_params(args, kwargs)
         
-        try:
-            # Execute Code Maat
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=300  # 5 minute timeout
-            )
+        if self.config.output_format == "json":
+            args.extend(["-f", "json"])
+        
+        return self._run_code_maat(log_file, args, self.config.output_format, log_stream)
+    
+    def _run_code_maat(self,
+                       log_file: Optional[str],
+                       args: List[str],
+                       output_format: str,
+                       log_stream: Optional[IO[bytes]] = None) -> Any:
+        """Run Code Maat with the given arguments and parse its output."""
+        # The persistent JVM cannot read another process' output as its stdin
+        if self.config.persistent_jvm and log_stream is None:
+            if jpype is not None:
+                output = JvmBridge.instance(self.config).run(args)
+            else:
+                with self._checkout_worker() as worker:
+                    output = worker.run(args)
+            return self._parse_output(output, output_format)
+        
+        cmd = [*self._java_cmd, *self._heap_opts(log_file), *self._jar_args, *args]
+        
+        # Stream stdout into the parser while Code Maat is still writing,
+        # instead of buffering the whole report first. stderr goes to a file
+        # so a chatty JVM can never block on a full pipe.
+        with tempfile.TemporaryFile() as stderr, \
+             _start_process(cmd, "Code Maat", stdin=log_stream, stdout=subprocess.PIPE,
+                            stderr=stderr, bufsize=1024 * 1024) as proc:
+            timed_out = threading.Event()
             
-            # Parse CSV output
-            return self._parse_csv_output(result.stdout)
+            def kill_on_timeout():
+                timed_out.set()
+                proc.kill()
             
-        except subprocess.CalledProcessError as e:
-            raise CodeMaatError(f"Code Maat execution failed: {e.stderr}")
-        except subprocess.TimeoutExpired:
-            raise CodeMaatError("Code Maat execution timed out")
+            watchdog = threading.Timer(self.ANALYSIS_TIMEOUT, kill_on_timeout)
+            watchdog.start()
+            try:
+                try:
+                    results = self._parse_stream(proc.stdout, output_format)
+                    parse_error = None
+                except CodeMaatError as e:
+                    # A failed run prints its error message instead of results
+                    results, parse_error = None, e
+                    proc.stdout.read()
+                returncode = proc.wait()
+            finally:
+                watchdog.cancel()
+            
+            if timed_out.is_set():
+                raise CodeMaatError("Code Maat execution timed out")
+            if returncode != 0:
+                stderr.seek(0)
+                raise CodeMaatError(f"Code Maat execution failed: {stderr.read().decode('utf-8', 'replace')}")
+            if parse_error is not None:
+                raise parse_error
+            
+            return results
+    
+    @contextlib.contextmanager
+    def _checkout_worker(self) -> Iterator[CodeMaatWorker]:
+        """Borrow an idle worker process, starting another while below worker_processes."""
+        try:
+            worker = self._idle_workers.get_nowait()
+        except queue.Empty:
+            with self._worker_lock:
+                create = self._worker_count < self.config.worker_processes
+                if create:
+                    self._worker_count += 1
+            worker = self._new_worker() if create else self._idle_workers.get()
+        
+        try:
+            yield worker
+        finally:
+            self._idle_workers.put(worker)
+    
+    def _new_worker(self) -> CodeMaatWorker:
+        return CodeMaatWorker(
+            [self.config.java_executable, *_persistent_java_opts(self.config.java_opts),
+             *self._jar_args, "--serve"],
+            timeout=self.ANALYSIS_TIMEOUT
+        )
     
     def _add_optional_params(self, cmd: List[str], kwargs: Dict[str, Any]):
         """Add optional parameters to the command."""
-        param_mapping = {
-            'rows': '-r',
-            'group': '-g',
-            'team_map_file': '-p',
-            'min_revs': '-n',
-            'min_shared_revs': '-m',
-            'min_coupling': '-i',
-            'max_coupling': '-x',
-            'max_changeset_size': '-s',
-            'expression_to_match': '-e',
-            'temporal_period': '-t',
-            'age_time_now': '-d',
-            'input_encoding': '--input-encoding'
-        }
-        
-        for param, value in kwargs.items():
-            if value is not None and param in param_mapping:
-                flag = param_mapping[param]
-                cmd.extend([flag, str(value)])
+        for param, flag in _PARAM_FLAGS.items():
+            value = kwargs.get(param)
+            if value is not None:
+                cmd.append(flag)
+                cmd.append(str(value))
         
         # Handle boolean flags
         if kwargs.get('verbose_results'):
             cmd.append('--verbose-results')
     
+    def _heap_opts(self, log_file: Optional[str]) -> List[str]:
+        """Size the JVM heap from the log file unless java_opts already do."""
+        if any(opt.startswith("-Xmx") for opt in self.config.java_opts):
+            return []
+        if log_file is None:
+            # The size of a streamed log is unknown up front
+            return [f"-Xmx{MAX_HEAP_MB}m"]
+        
+        log_mb = os.path.getsize(log_file) // (1024 * 1024)
+        heap_mb = max(MIN_HEAP_MB, min(MAX_HEAP_MB, log_mb * 8))
+        return [f"-Xmx{heap_mb}m"]
+    
+    def _parse_output(self, output: str, output_format: str) -> Any:
+        """Parse Code Maat output in the given output format."""
+        if output_format == "json":
+            return self._parse_json_output(output)
+        return self._parse_csv_output(output)
+    
+    def _parse_stream(self, stream: IO[bytes], output_format: str) -> Any:
+        """Parse Code Maat output from a binary stream in the given output format."""
+        # pandas and the JSON parsers decode the raw bytes themselves, so
+        # text decoding is only added for the csv module fallback.
+        if output_format == "json":
+            return self._parse_json_output(stream.read())
+        if pd is not None:
+            return self._parse_csv_stream(stream)
+        
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            return self._parse_csv_stream(text)
+        finally:
+            # Hand the stream back so the caller can still drain it
+            text.detach()
+    
+    def _parse_json_output(self, json_output: Union[str, bytes]) -> Any:
+        """Parse JSON output; values already carry their types."""
+        if not json_output.strip():
+            return []
+        
+        try:
+            return _json_loads(json_output)
+        except ValueError as e:
+            raise CodeMaatError(f"Failed to parse JSON output: {e}")
+    
     def _parse_csv_output(self, csv_output: str) -> List[Dict[str, Any]]:
         """Parse CSV output into structured data."""
         if not csv_output.strip():
             return []
         
+        return self._parse_csv_stream(io.StringIO(csv_output))
+    
+    def _parse_csv_stream(self, stream: IO) -> List[Dict[str, Any]]:
+        """Parse CSV rows from a stream as they arrive.
+        
+        Binary streams are only supported with pandas.
+        """
         try:
-            reader = csv.DictReader(io.StringIO(csv_output))
-            results = []
+            if pd is not None:
+                return self._parse_csv_with_pandas(stream)
             
-            for row in reader:
-                # Convert numeric strings to appropriate types
-                converted_row = {}
-                for key, value in row.items():
-                    converted_row[key] = self._convert_value(value)
-                results.append(converted_row)
+            reader = _split_csv_lines(stream)
+            header = next(reader, None)
+            if header is None:
+                return []
+            # Blank lines are skipped and rows cut or padded to the header,
+            # as pandas does, so that a ragged row cannot shorten the columns
+            padding = [""] * len(header)
+            columns = list(zip(*((row + padding)[:len(header)] for row in reader if row)))
+            if not columns:
+                return []
             
-            return results
+            # Convert numeric strings to appropriate types, column by column
+            converted = [self._convert_column(column) for column in columns]
+            return [dict(zip(header, row)) for row in zip(*converted)]
             
         except Exception as e:
             raise CodeMaatError(f"Failed to parse CSV output: {e}")
     
+    def _parse_csv_with_pandas(self, stream: IO) -> List[Dict[str, Any]]:
+        """Parse CSV output with pandas' C tokenizer.
+        
+        Cells are read as plain strings and converted like the csv module
+        fallback does, so results do not depend on pandas being installed;
+        pandas' own type inference would turn an int column with a blank
+        cell into floats and keep numbers in mixed columns as strings.
+        index_col=False cuts overlong rows to the header instead of taking
+        their first cells as an index.
+        """
+        try:
+            df = pd.read_csv(stream, engine="c", encoding="utf-8", index_col=False,
+                             dtype=str, keep_default_na=False, na_filter=False)
+        except pd.errors.EmptyDataError:
+            return []
+        header = list(df.columns)
+        converted = [self._convert_column(df[name].tolist()) for name in header]
+        return [dict(zip(header, row)) for row in zip(*converted)]
+    
+    def _convert_column(self, column: Sequence[str]) -> List[Union[str, int, float]]:
+        """Convert a whole CSV column, taking a C-level fast path for integer columns."""
+        # Most Code Maat columns are either all integers (revisions, degrees,
+        # line counts) or text. int() over the whole column fails on the first
+        # text cell, so text columns only pay for one exception.
+        try:
+            return list(map(int, column))
+        except ValueError:
+            return [self._convert_value(value) for value in column]
+    
     def _convert_value(self, value: str) -> Union[str, int, float]:
         """Convert string values to appropriate types."""
-        if not value or value.strip() == '':
+        if not value:
             return None
         
-        # Try to convert to int
-        try:
+        value = value.strip()
+        if not value:
+            return None
+        
+        if _INT_RE.fullmatch(value):
             return int(value)
-        except ValueError:
-            pass
         
-        # Try to convert to float
-        try:
+        if _FLOAT_RE.fullmatch(value):
             return float(value)
-        except ValueError:
-            pass
         
         # Return as string
-        return value.strip()
+        return value
     
     def generate_git_log(self, 
                         repo_path: str,
-                        output_file: str,
+                        output_file: Optional[str] = None,
                         format_type: str = "git2",
                         after_date: Optional[str] = None,
-                        exclude_paths: Optional[List[str]] = None) -> str:
+                        exclude_paths: Optional[List[str]] = None,
+                        stream: bool = False) -> Union[str, subprocess.Popen]:
         """
         Generate a git log file suitable for Code Maat analysis.
         
         Args:
             repo_path: Path to git repository
-            output_file: Output log file path
+            output_file: Output log file path, unused with stream
             format_type: "git" or "git2" format
             after_date: Date filter (YYYY-MM-DD)
             exclude_paths: Paths to exclude from analysis
+            stream: Return the running git process instead of writing a file
         
         Returns:
-            Path to generated log file
+            Path to generated log file, or with stream the git log process;
+            its stdout carries the log and the caller waits for it
         """
         if not os.path.exists(repo_path):
             raise CodeMaatError(f"Repository path not found: {repo_path}")
@@ -254,57 +1041,91 @@ class CodeMaatWrapper:
             for path in exclude_paths:
                 cmd.append(f":(exclude){path}")
         
-        try:
-            # Change to repository directory and run git log
-            result = subprocess.run(
+        if stream:
+            # git writes little to stderr, so leaving it in a pipe cannot block
+            return _start_process(
                 cmd,
+                "git",
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
             )
-            
-            # Write output to file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+        
+        if not output_file:
+            raise CodeMaatError("No output file given for the git log")
+        
+        try:
+            # Run git log in the repository and stream its output straight
+            # into the log file, so large histories never sit in memory
+            with open(output_file, 'wb') as f:
+                subprocess.run(
+                    cmd,
+                    cwd=repo_path,
+                    stdout=f,
+                    stderr=subprocess.PIPE,
+                    check=True,
+                    close_fds=False
+                )
             
             return output_file
             
         except subprocess.CalledProcessError as e:
-            raise CodeMaatError(f"Git log generation failed: {e.stderr}")
+            stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ""
+            raise CodeMaatError(f"Git log generation failed: {stderr}")
+        except OSError as e:
+            # git missing, or the log file cannot be written
+            raise CodeMaatError(f"Git log generation failed: {e}")
+    
+    def analyze_repository(self,
+                           repo_path: str,
+                           analysis: str,
+                           format_type: str = "git2",
+                           after_date: Optional[str] = None,
+                           exclude_paths: Optional[List[str]] = None,
+                           **kwargs) -> List[Dict[str, Any]]:
+        """
+        Run a Code Maat analysis straight on a git repository.
+        
+        git log is piped into Code Maat, so no log file is written and
+        Code Maat parses the history while git is still producing it.
+        The arguments are those of generate_git_log and run_analysis.
+        """
+        git = self.generate_git_log(
+            repo_path,
+            format_type=format_type,
+            after_date=after_date,
+            exclude_paths=exclude_paths,
+            stream=True
+        )
+        with git:
+            try:
+                results = self.run_analysis(
+                    None, format_type, analysis, log_stream=git.stdout, **kwargs
+                )
+                error = None
+            except CodeMaatError as e:
+                results, error = None, e
+            # Without our end of the pipe, git cannot outlive a failed Code Maat
+            git.stdout.close()
+            stderr = git.stderr.read()
+            returncode = git.wait()
+        
+        # A negative code is a signal, e.g. SIGPIPE after Code Maat failed
+        if returncode > 0:
+            raise CodeMaatError(
+                f"Git log generation failed: {stderr.decode('utf-8', errors='replace')}"
+            )
+        if error is not None:
+            raise error
+        return results
     
-    def get_analysis_info(self, analysis: str) -> Dict[str, Any]:
+    def get_analysis_info(self, analysis: str) -> Mapping[str, Any]:
         """Get information about a specific analysis type."""
-        analysis_info = {
-            "authors": {
-                "description": "Number of authors per module and revision count",
-                "output_columns": ["entity", "n-authors", "n-revs"],
-                "use_case": "Identify modules with high communication overhead"
-            },
-            "coupling": {
-                "description": "Logical coupling between modules that tend to change together",
-                "output_columns": ["entity", "coupled", "degree", "average-revs"],
-                "use_case": "Find hidden dependencies and refactoring candidates"
-            },
-            "summary": {
-                "description": "Overview statistics of the repository",
-                "output_columns": ["statistic", "value"],
-                "use_case": "Get high-level metrics about the codebase"
-            },
-            "churn": {
-                "description": "Code churn metrics showing change frequency",
-                "output_columns": ["entity", "added", "deleted"],
-                "use_case": "Identify unstable code areas"
-            },
-            "age": {
-                "description": "Code age showing how long since modules were last changed",
-                "output_columns": ["entity", "age-months"],
-                "use_case": "Find stable vs frequently changing code"
-            }
-        }
+        info = _ANALYSIS_INFO.get(analysis)
+        if info is not None:
+            return info
         
-        return analysis_info.get(analysis, {
+        return {
             "description": f"Analysis type: {analysis}",
-            "output_columns": ["varies"],
-            "use_case": "Refer to Code Maat documentation for details"
-        })
\ No newline at end of file
+            **_DEFAULT_ANALYSIS_INFO
+        }
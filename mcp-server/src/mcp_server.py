@@ -4,14 +4,27 @@ Model Context Protocol server for Code Maat VCS analysis tool.
 
 import json
 import logging
+import sys
+import threading
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent
 
+from .code_maat_wrapper import CodeMaatWrapper
 from .tools.analysis_tools import AnalysisTools
 from .tools.utility_tools import UtilityTools
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, used to speed up JSON I/O
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional, used as a faster event loop
+    uvloop = None
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,9 +34,11 @@ logger = logging.getLogger(__name__)
 # Create the FastMCP server
 mcp = FastMCP("code-maat-mcp-server")
 
-# Initialize analysis and utility tools
-analysis_tools = AnalysisTools()
-utility_tools = UtilityTools()
+# Initialize analysis and utility tools. They share one wrapper, so a
+# persistent JVM and the result cache serve both.
+wrapper = CodeMaatWrapper()
+analysis_tools = AnalysisTools(wrapper)
+utility_tools = UtilityTools(wrapper)
 
 # Add all analysis tools
 @mcp.tool()
@@ -33,7 +48,9 @@ async def run_coupling_analysis(
     min_coupling: int = 30,
     max_coupling: int = 100,
     min_revs: int = 5,
-    max_changeset_size: int = 30
+    max_changeset_size: int = 30,
+    no_cache: bool = False,
+    output_format: str = "markdown"
 ) -> str:
     """Analyze logical coupling between modules that tend to change together."""
     arguments = {
@@ -44,22 +61,34 @@ async def run_coupling_analysis(
         "min_revs": min_revs,
         "max_changeset_size": max_changeset_size
     }
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_coupling_analysis(arguments)
     return result[0].text
 
 @mcp.tool()
-async def run_summary_analysis(log_file: str, vcs: str) -> str:
+async def run_summary_analysis(log_file: str, vcs: str, no_cache: bool = False, output_format: str = "markdown") -> str:
     """Generate overview statistics of the repository."""
     arguments = {"log_file": log_file, "vcs": vcs}
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_summary_analysis(arguments)
     return result[0].text
 
 @mcp.tool()
-async def run_authors_analysis(log_file: str, vcs: str, min_revs: int = 5, rows: int = None) -> str:
+async def run_authors_analysis(log_file: str, vcs: str, min_revs: int = 5, rows: int = None, no_cache: bool = False, output_format: str = "markdown") -> str:
     """Analyze developer contribution metrics per module."""
     arguments = {"log_file": log_file, "vcs": vcs, "min_revs": min_revs}
     if rows:
         arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_authors_analysis(arguments)
     return result[0].text
 
@@ -69,7 +98,9 @@ async def run_churn_analysis(
     vcs: str, 
     churn_type: str = "entity-churn",
     min_revs: int = 5,
-    rows: int = None
+    rows: int = None,
+    no_cache: bool = False,
+    output_format: str = "markdown"
 ) -> str:
     """Analyze code churn patterns (entity-churn, author-churn, or abs-churn)."""
     arguments = {
@@ -80,38 +111,126 @@ async def run_churn_analysis(
     }
     if rows:
         arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_churn_analysis(arguments)
     return result[0].text
 
 @mcp.tool()
-async def run_age_analysis(log_file: str, vcs: str, age_time_now: str = None, rows: int = None) -> str:
+async def run_age_analysis(log_file: str, vcs: str, age_time_now: str = None, rows: int = None, no_cache: bool = False, output_format: str = "markdown") -> str:
     """Analyze code age and stability metrics."""
     arguments = {"log_file": log_file, "vcs": vcs}
     if age_time_now:
         arguments["age_time_now"] = age_time_now
     if rows:
         arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_age_analysis(arguments)
     return result[0].text
 
 @mcp.tool()
-async def run_entity_effort_analysis(log_file: str, vcs: str, min_revs: int = 5, rows: int = None) -> str:
+async def run_entity_effort_analysis(log_file: str, vcs: str, min_revs: int = 5, rows: int = None, no_cache: bool = False, output_format: str = "markdown") -> str:
     """Analyze effort distribution among developers per entity."""
     arguments = {"log_file": log_file, "vcs": vcs, "min_revs": min_revs}
     if rows:
         arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_entity_effort_analysis(arguments)
     return result[0].text
 
 @mcp.tool()
-async def run_communication_analysis(log_file: str, vcs: str, min_shared_revs: int = 5, rows: int = None) -> str:
+async def run_communication_analysis(log_file: str, vcs: str, min_shared_revs: int = 5, rows: int = None, no_cache: bool = False, output_format: str = "markdown") -> str:
     """Analyze communication patterns between developers."""
     arguments = {"log_file": log_file, "vcs": vcs, "min_shared_revs": min_shared_revs}
     if rows:
         arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
     result = await analysis_tools.run_communication_analysis(arguments)
     return result[0].text
 
+@mcp.tool()
+async def run_analysis_bundle(
+    log_file: str,
+    vcs: str,
+    analyses: list[str],
+    min_revs: int = 5,
+    rows: int = None,
+    no_cache: bool = False,
+    output_format: str = "markdown"
+) -> str:
+    """Run several analyses on a single parse of the log file."""
+    arguments = {
+        "log_file": log_file,
+        "vcs": vcs,
+        "analyses": analyses,
+        "min_revs": min_revs
+    }
+    if rows:
+        arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
+    result = await analysis_tools.run_analysis_bundle(arguments)
+    return result[0].text
+
+@mcp.tool()
+async def run_all_analyses(
+    log_file: str,
+    vcs: str,
+    min_revs: int = 5,
+    rows: int = None,
+    no_cache: bool = False,
+    output_format: str = "markdown"
+) -> str:
+    """Run the standard analyses on a single parse of the log file."""
+    arguments = {"log_file": log_file, "vcs": vcs, "min_revs": min_revs}
+    if rows:
+        arguments["rows"] = rows
+    if no_cache:
+        arguments["no_cache"] = True
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
+    result = await analysis_tools.run_all_analyses(arguments)
+    return result[0].text
+
+@mcp.tool()
+async def analyze_repository(
+    repo_path: str,
+    analysis: str,
+    format_type: str = "git2",
+    after_date: str = None,
+    exclude_paths: list[str] = None,
+    min_revs: int = None,
+    rows: int = None,
+    output_format: str = "markdown"
+) -> str:
+    """Run an analysis on a git repository, piping git log into Code Maat without a log file."""
+    arguments = {"repo_path": repo_path, "analysis": analysis, "format_type": format_type}
+    if after_date:
+        arguments["after_date"] = after_date
+    if exclude_paths:
+        arguments["exclude_paths"] = exclude_paths
+    if min_revs is not None:
+        arguments["min_revs"] = min_revs
+    if rows:
+        arguments["rows"] = rows
+    if output_format != "markdown":
+        arguments["output_format"] = output_format
+    result = await analysis_tools.analyze_repository(arguments)
+    return result[0].text
+
 # Add utility tools
 @mcp.tool()
 async def generate_git_log(
@@ -119,7 +238,8 @@ async def generate_git_log(
     output_file: str = None,
     format_type: str = "git2",
     after_date: str = None,
-    exclude_paths: list[str] = None
+    exclude_paths: list[str] = None,
+    include_stats: bool = False
 ) -> str:
     """Generate a git log file suitable for Code Maat analysis."""
     arguments = {
@@ -132,6 +252,8 @@ async def generate_git_log(
         arguments["after_date"] = after_date
     if exclude_paths:
         arguments["exclude_paths"] = exclude_paths
+    if include_stats:
+        arguments["include_stats"] = include_stats
     result = await utility_tools.generate_git_log(arguments)
     return result[0].text
 
@@ -176,6 +298,8 @@ async def get_config() -> str:
         "supported_vcs": list(analysis_tools.wrapper.SUPPORTED_VCS),
         "supported_analyses": list(analysis_tools.wrapper.SUPPORTED_ANALYSES)
     }
+    if orjson is not None:
+        return orjson.dumps(config_info, option=orjson.OPT_INDENT_2).decode()
     return json.dumps(config_info, indent=2)
 
 @mcp.resource("code-maat://help")
@@ -189,9 +313,15 @@ This server provides Code Maat VCS analysis capabilities through MCP.
 1. Generate git log: `generate_git_log(repo_path="/path/to/repo")`
 2. Run summary: `run_summary_analysis(log_file="logfile.log", vcs="git2")`
 3. Find coupling: `run_coupling_analysis(log_file="logfile.log", vcs="git2")`
+4. Several at once: `run_analysis_bundle(log_file="logfile.log", vcs="git2", analyses=["summary", "coupling", "authors"])`
+5. Everything at once: `run_all_analyses(log_file="logfile.log", vcs="git2")`
+6. Without a log file: `analyze_repository(repo_path="/path/to/repo", analysis="summary")`
 
 ## Available Tools
 - Analysis: coupling, summary, authors, churn, age, effort, communication
+- Bundles: run_analysis_bundle parses the log once for several analyses,
+  run_all_analyses does so for all standard analyses
+- Streaming: analyze_repository pipes git log straight into Code Maat
 - Utilities: generate_git_log, validate_log_file, check_code_maat_status
 
 Use `list_available_analyses()` for more details.
@@ -209,9 +339,20 @@ def main():
             logger.warning(f"Code Maat JAR not found at: {analysis_tools.wrapper.config.jar_path}")
         else:
             logger.info(f"Code Maat JAR found at: {analysis_tools.wrapper.config.jar_path}")
+            # Overlap JVM startup with client connection setup
+            threading.Thread(
+                target=analysis_tools.wrapper.warm_up,
+                name="code-maat-warmup",
+                daemon=True
+            ).start()
     except Exception as e:
         logger.error(f"Error checking Code Maat: {e}")
     
+    # uvloop.install() swaps the event loop policy, which is deprecated
+    # from Python 3.12 on
+    if uvloop is not None and sys.version_info < (3, 12):
+        uvloop.install()
+    
     # Run the FastMCP server with stdio transport
     mcp.run()
 
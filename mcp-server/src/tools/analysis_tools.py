@@ -2,22 +2,208 @@
 MCP tools for Code Maat analysis functions.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from mcp.types import Tool, TextContent
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import asyncio
+import csv
+import functools
+import io
+import itertools
 import json
+import operator
 import os
 
 from ..code_maat_wrapper import CodeMaatWrapper, CodeMaatError
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, used to speed up JSON I/O
+    orjson = None
+
+
+# Analyses spend their time waiting on the Code Maat JVM, so threads are
+# enough to run several of them at once. Unlike a process pool they also
+# share the wrapper's result cache. The pool allows one thread per CPU
+# with a floor of four: the threads mostly block on the JVM rather than
+# compete for a core, and on one- or two-CPU hosts a smaller pool would
+# serialize independent analyses.
+_ANALYSIS_POOL = ThreadPoolExecutor(
+    max_workers=max(4, os.cpu_count() or 1), thread_name_prefix="code-maat"
+)
+
+# Options that run_analysis_bundle passes on to every analysis in the bundle
+_BUNDLE_OPTIONS = (
+    "min_revs", "min_shared_revs", "min_coupling", "max_coupling",
+    "max_changeset_size", "age_time_now", "rows"
+)
+
+# Analyses run by run_all_analyses, in report order
+_ALL_ANALYSES = (
+    "summary", "authors", "coupling", "age", "entity-effort", "communication", "abs-churn"
+)
+
+# Field that labels each row of the churn analyses
+_CHURN_LABEL_FIELDS = {
+    "entity-churn": "entity",
+    "author-churn": "author",
+    "abs-churn": "date"
+}
+
+
+def _peek_rows(rows: Iterable[Dict[str, Any]]) -> Optional[Iterator[Dict[str, Any]]]:
+    """Return an iterator over rows, or None when there are none.
+    
+    Only the first row is consumed to find out, so generators are formatted
+    as their rows arrive instead of being collected into a list first.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None
+    return itertools.chain((first,), rows)
+
+
+def _field_getter(*fields: Tuple[str, Any]) -> Callable[[Dict[str, Any]], tuple]:
+    """Build a function that reads several (name, default) fields from a row.
+    
+    Rows from Code Maat carry every column of their analysis, so the
+    itemgetter fast path almost always applies. Incomplete rows fall back
+    to the defaults instead of raising KeyError.
+    """
+    get = operator.itemgetter(*(name for name, _ in fields))
+    
+    def getter(item: Dict[str, Any]) -> tuple:
+        try:
+            return get(item)
+        except KeyError:
+            return tuple(item.get(name, default) for name, default in fields)
+    
+    return getter
+
+
+# Fields read from each row by the result formatters
+_COUPLING_FIELDS = _field_getter(("entity", ""), ("coupled", ""), ("degree", 0), ("average-revs", 0))
+_SUMMARY_FIELDS = _field_getter(("statistic", ""), ("value", ""))
+_AUTHORS_FIELDS = _field_getter(("entity", ""), ("n-authors", 0), ("n-revs", 0))
+_AGE_FIELDS = _field_getter(("entity", ""), ("age-months", 0))
+_ENTITY_EFFORT_FIELDS = _field_getter(
+    ("entity", ""), ("author", ""), ("author-revs", 0), ("total-revs", 0)
+)
+_COMMUNICATION_FIELDS = _field_getter(("author", ""), ("peer", ""), ("shared", 0))
+
+
+def _rows_to_json(rows: Any) -> str:
+    """Serialize analysis rows, or a bundle of them, as compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(rows).decode("utf-8")
+    return json.dumps(rows, ensure_ascii=False)
+
+
+def _rows_to_csv(rows: Iterable[Dict[str, Any]]) -> str:
+    """Serialize analysis rows as CSV with a header line, or "" without rows."""
+    rows = _peek_rows(rows)
+    if rows is None:
+        return ""
+    
+    first = next(rows)
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(first), lineterminator="\n")
+    writer.writeheader()
+    writer.writerow(first)
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+@dataclass(frozen=True)
+class _AnalysisHandler:
+    """How a single-analysis tool maps its arguments onto a Code Maat run."""
+    analysis: str  # Code Maat analysis, or the default of analysis_argument
+    label: str  # Names the analysis in error messages
+    formatter: str  # AnalysisTools method rendering the results as markdown
+    options: Tuple[Tuple[str, Any], ...] = ()  # (argument, default) pairs
+    analysis_argument: Optional[str] = None  # Argument choosing the analysis
+
+
+_ANALYSIS_HANDLERS = {
+    "run_coupling_analysis": _AnalysisHandler(
+        "coupling", "coupling", "_format_coupling_results",
+        (("min_coupling", 30), ("max_coupling", 100), ("min_revs", 5), ("max_changeset_size", 30))
+    ),
+    "run_summary_analysis": _AnalysisHandler("summary", "summary", "_format_summary_results"),
+    "run_authors_analysis": _AnalysisHandler(
+        "authors", "authors", "_format_authors_results", (("min_revs", 5), ("rows", None))
+    ),
+    "run_churn_analysis": _AnalysisHandler(
+        "entity-churn", "churn", "_format_churn_results", (("min_revs", 5), ("rows", None)),
+        analysis_argument="churn_type"
+    ),
+    "run_age_analysis": _AnalysisHandler(
+        "age", "age", "_format_age_results", (("age_time_now", None), ("rows", None))
+    ),
+    "run_entity_effort_analysis": _AnalysisHandler(
+        "entity-effort", "entity effort", "_format_entity_effort_results",
+        (("min_revs", 5), ("rows", None))
+    ),
+    "run_communication_analysis": _AnalysisHandler(
+        "communication", "communication", "_format_communication_results",
+        (("min_shared_revs", 5), ("rows", None))
+    )
+}
+
+# Python types accepted for the JSON schema types used by the tool schemas
+_SCHEMA_TYPES = {"string": str, "integer": int, "boolean": bool, "array": list}
+
+
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+    """Build a function that checks tool arguments against a tool's inputSchema.
+    
+    The schema is walked once, so each call only runs the type and enum
+    checks. Invalid arguments raise CodeMaatError before Code Maat starts.
+    Analysis names inside arrays are left to CodeMaatWrapper.validate_inputs.
+    """
+    required = tuple(schema.get("required", ()))
+    checks = [
+        (name, spec["type"], _SCHEMA_TYPES[spec["type"]], spec.get("enum"))
+        for name, spec in schema["properties"].items()
+    ]
+    
+    def validate(arguments: Dict[str, Any]):
+        missing = [name for name in required if name not in arguments]
+        if missing:
+            raise CodeMaatError(f"Missing required argument: {', '.join(missing)}")
+        
+        for name, type_name, expected, choices in checks:
+            value = arguments.get(name)
+            if value is None:
+                continue
+            # bool is a subclass of int, but True is no valid row count
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                raise CodeMaatError(f"Invalid {name}: expected {type_name}, got {value!r}")
+            if choices is not None and value not in choices:
+                raise CodeMaatError(
+                    f"Unsupported {name.replace('_', ' ')}: {value}. Supported: {', '.join(choices)}"
+                )
+    
+    return validate
+
 
 class AnalysisTools:
     """MCP tools for running Code Maat analyses."""
     
-    def __init__(self):
-        self.wrapper = CodeMaatWrapper()
+    def __init__(self, wrapper: Optional[CodeMaatWrapper] = None):
+        self.wrapper = wrapper if wrapper is not None else CodeMaatWrapper()
+        self._tools = _TOOLS
+        self._validators = _VALIDATORS
     
     def get_tools(self) -> List[Tool]:
         """Return list of MCP tools for analysis functions."""
+        return self._tools
+    
+    @classmethod
+    def _build_tools(cls) -> List[Tool]:
+        """Build the tool list; the schemas are static, so _TOOLS holds it once per process."""
         return [
             Tool(
                 name="run_coupling_analysis",
@@ -34,6 +220,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "min_coupling": {
                             "type": "integer",
                             "description": "Minimum coupling percentage to include (default: 30)",
@@ -72,6 +269,17 @@ class AnalysisTools:
                             "type": "string",
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
+                        },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
                         }
                     },
                     "required": ["log_file", "vcs"]
@@ -92,6 +300,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "min_revs": {
                             "type": "integer",
                             "description": "Minimum revisions to include entity (default: 5)",
@@ -120,6 +339,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "churn_type": {
                             "type": "string",
                             "enum": ["entity-churn", "author-churn", "abs-churn"],
@@ -154,6 +384,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "age_time_now": {
                             "type": "string",
                             "description": "Reference date for age calculation (YYYY-MM-DD format)"
@@ -181,6 +422,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "min_revs": {
                             "type": "integer",
                             "description": "Minimum revisions to include entity (default: 5)",
@@ -209,6 +461,17 @@ class AnalysisTools:
                             "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
                             "description": "Version control system type"
                         },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
                         "min_shared_revs": {
                             "type": "integer",
                             "description": "Minimum shared revisions to include (default: 5)",
@@ -221,336 +484,476 @@ class AnalysisTools:
                     },
                     "required": ["log_file", "vcs"]
                 }
+            ),
+            Tool(
+                name="run_analysis_bundle",
+                description="Run several analyses on a single parse of the log file",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "log_file": {
+                            "type": "string",
+                            "description": "Path to the VCS log file"
+                        },
+                        "vcs": {
+                            "type": "string",
+                            "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
+                            "description": "Version control system type"
+                        },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
+                        "analyses": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                                "enum": sorted(CodeMaatWrapper.SUPPORTED_ANALYSES)
+                            },
+                            "description": "Analyses to run, e.g. summary, coupling and authors"
+                        },
+                        "min_revs": {
+                            "type": "integer",
+                            "description": "Minimum revisions to include entity (default: 5)",
+                            "default": 5
+                        },
+                        "rows": {
+                            "type": "integer",
+                            "description": "Maximum number of results to return per analysis"
+                        }
+                    },
+                    "required": ["log_file", "vcs", "analyses"]
+                }
+            ),
+            Tool(
+                name="run_all_analyses",
+                description="Run the standard analyses (summary, authors, coupling, age, "
+                            "entity effort, communication and absolute churn) on a single "
+                            "parse of the log file",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "log_file": {
+                            "type": "string",
+                            "description": "Path to the VCS log file"
+                        },
+                        "vcs": {
+                            "type": "string",
+                            "enum": ["git", "git2", "svn", "hg", "p4", "tfs"],
+                            "description": "Version control system type"
+                        },
+                        "no_cache": {
+                            "type": "boolean",
+                            "description": "Re-run Code Maat even if a cached result exists (default: false)",
+                            "default": False
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
+                        "min_revs": {
+                            "type": "integer",
+                            "description": "Minimum revisions to include entity (default: 5)",
+                            "default": 5
+                        },
+                        "rows": {
+                            "type": "integer",
+                            "description": "Maximum number of results to return per analysis"
+                        }
+                    },
+                    "required": ["log_file", "vcs"]
+                }
+            ),
+            Tool(
+                name="analyze_repository",
+                description="Run an analysis straight on a git repository, piping git log "
+                            "into Code Maat without writing a log file",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "repo_path": {
+                            "type": "string",
+                            "description": "Path to the git repository"
+                        },
+                        "analysis": {
+                            "type": "string",
+                            "description": "Analysis to run, e.g. summary, coupling or authors"
+                        },
+                        "format_type": {
+                            "type": "string",
+                            "enum": ["git", "git2"],
+                            "description": "Git log format type (git2 is recommended)",
+                            "default": "git2"
+                        },
+                        "after_date": {
+                            "type": "string",
+                            "description": "Only include commits after this date (YYYY-MM-DD format)"
+                        },
+                        "exclude_paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Paths to exclude from analysis (e.g., vendor/, test/)"
+                        },
+                        "output_format": {
+                            "type": "string",
+                            "enum": ["markdown", "json", "csv"],
+                            "description": "Return a markdown report, or the raw rows as JSON or CSV (default: markdown)",
+                            "default": "markdown"
+                        },
+                        "min_revs": {
+                            "type": "integer",
+                            "description": "Minimum revisions to include entity (default: 5)",
+                            "default": 5
+                        },
+                        "rows": {
+                            "type": "integer",
+                            "description": "Maximum number of results to return"
+                        }
+                    },
+                    "required": ["repo_path", "analysis"]
+                }
             )
         ]
     
+    async def _run_analysis(self, **kwargs) -> List[Dict[str, Any]]:
+        """Run a Code Maat analysis without blocking the event loop."""
+        return await self._run_in_pool(self.wrapper.run_analysis, **kwargs)
+    
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """Call a blocking wrapper method on the analysis pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _ANALYSIS_POOL, functools.partial(func, *args, **kwargs)
+        )
+    
     async def run_coupling_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute logical coupling analysis."""
-        try:
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis="coupling",
-                min_coupling=arguments.get("min_coupling", 30),
-                max_coupling=arguments.get("max_coupling", 100),
-                min_revs=arguments.get("min_revs", 5),
-                max_changeset_size=arguments.get("max_changeset_size", 30)
-            )
-            
-            return [TextContent(
-                type="text",
-                text=self._format_coupling_results(results)
-            )]
-            
-        except CodeMaatError as e:
-            return [TextContent(
-                type="text", 
-                text=f"Error running coupling analysis: {str(e)}"
-            )]
+        return await self._run("run_coupling_analysis", arguments)
     
     async def run_summary_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute summary analysis."""
-        try:
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis="summary"
-            )
-            
-            return [TextContent(
-                type="text",
-                text=self._format_summary_results(results)
-            )]
-            
-        except CodeMaatError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error running summary analysis: {str(e)}"
-            )]
+        return await self._run("run_summary_analysis", arguments)
     
     async def run_authors_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute authors analysis."""
-        try:
-            kwargs = {
-                "min_revs": arguments.get("min_revs", 5)
-            }
-            if "rows" in arguments:
-                kwargs["rows"] = arguments["rows"]
-                
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis="authors",
-                **kwargs
-            )
-            
-            return [TextContent(
-                type="text",
-                text=self._format_authors_results(results)
-            )]
-            
-        except CodeMaatError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error running authors analysis: {str(e)}"
-            )]
+        return await self._run("run_authors_analysis", arguments)
     
     async def run_churn_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute churn analysis."""
-        try:
-            churn_type = arguments.get("churn_type", "entity-churn")
-            kwargs = {
-                "min_revs": arguments.get("min_revs", 5)
-            }
-            if "rows" in arguments:
-                kwargs["rows"] = arguments["rows"]
-                
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis=churn_type,
-                **kwargs
-            )
-            
-            return [TextContent(
-                type="text",
-                text=self._format_churn_results(results, churn_type)
-            )]
-            
-        except CodeMaatError as e:
-            return [TextContent(
-                type="text",
-                text=f"Error running churn analysis: {str(e)}"
-            )]
+        return await self._run("run_churn_analysis", arguments)
     
     async def run_age_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute age analysis."""
+        return await self._run("run_age_analysis", arguments)
+    
+    async def run_entity_effort_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Execute entity effort analysis."""
+        return await self._run("run_entity_effort_analysis", arguments)
+    
+    async def run_communication_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Execute communication analysis."""
+        return await self._run("run_communication_analysis", arguments)
+    
+    async def _run(self, tool_name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Run the analysis behind a single-analysis tool and render its results."""
+        handler = _ANALYSIS_HANDLERS[tool_name]
         try:
+            self._validators[tool_name](arguments)
+            
+            analysis = handler.analysis
+            if handler.analysis_argument:
+                analysis = arguments.get(handler.analysis_argument, analysis)
+            
+            # Options defaulting to None are only passed when they are given
             kwargs = {}
-            if "age_time_now" in arguments:
-                kwargs["age_time_now"] = arguments["age_time_now"]
-            if "rows" in arguments:
-                kwargs["rows"] = arguments["rows"]
-                
-            results = self.wrapper.run_analysis(
+            for option, default in handler.options:
+                value = arguments.get(option, default)
+                if value is not None:
+                    kwargs[option] = value
+            
+            results = await self._run_analysis(
                 log_file=arguments["log_file"],
                 vcs=arguments["vcs"],
-                analysis="age",
+                use_cache=not arguments.get("no_cache", False),
+                analysis=analysis,
                 **kwargs
             )
             
+            formatter_args = (analysis,) if handler.analysis_argument else ()
             return [TextContent(
                 type="text",
-                text=self._format_age_results(results)
+                text=self._render_results(
+                    arguments, getattr(self, handler.formatter), results, *formatter_args
+                )
             )]
             
         except CodeMaatError as e:
             return [TextContent(
                 type="text",
-                text=f"Error running age analysis: {str(e)}"
+                text=f"Error running {handler.label} analysis: {str(e)}"
             )]
     
-    async def run_entity_effort_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Execute entity effort analysis."""
+    async def run_analysis_bundle(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Execute several analyses in one Code Maat run."""
         try:
+            self._validators["run_analysis_bundle"](arguments)
+            analyses = arguments["analyses"]
             kwargs = {
-                "min_revs": arguments.get("min_revs", 5)
+                option: arguments[option]
+                for option in _BUNDLE_OPTIONS
+                if arguments.get(option) is not None
             }
-            if "rows" in arguments:
-                kwargs["rows"] = arguments["rows"]
-                
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis="entity-effort",
-                **kwargs
+            
+            bundle = await self._run_in_pool(
+                self.wrapper.run_analysis_bundle,
+                arguments["log_file"], arguments["vcs"], analyses,
+                use_cache=not arguments.get("no_cache", False), **kwargs
             )
             
             return [TextContent(
                 type="text",
-                text=self._format_entity_effort_results(results)
+                text=self._render_bundle(arguments, bundle)
             )]
             
         except CodeMaatError as e:
             return [TextContent(
                 type="text",
-                text=f"Error running entity effort analysis: {str(e)}"
+                text=f"Error running analysis bundle: {str(e)}"
             )]
     
-    async def run_communication_analysis(self, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Execute communication analysis."""
+    async def run_all_analyses(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Execute the standard analyses in one Code Maat run."""
+        return await self.run_analysis_bundle({**arguments, "analyses": list(_ALL_ANALYSES)})
+    
+    async def analyze_repository(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Execute an analysis on the git log of a repository, without a log file."""
         try:
+            self._validators["analyze_repository"](arguments)
+            analysis = arguments["analysis"]
             kwargs = {
-                "min_shared_revs": arguments.get("min_shared_revs", 5)
+                option: arguments[option]
+                for option in _BUNDLE_OPTIONS
+                if arguments.get(option) is not None
             }
-            if "rows" in arguments:
-                kwargs["rows"] = arguments["rows"]
-                
-            results = self.wrapper.run_analysis(
-                log_file=arguments["log_file"],
-                vcs=arguments["vcs"],
-                analysis="communication",
+            
+            results = await self._run_in_pool(
+                self.wrapper.analyze_repository,
+                arguments["repo_path"], analysis,
+                format_type=arguments.get("format_type", "git2"),
+                after_date=arguments.get("after_date"),
+                exclude_paths=arguments.get("exclude_paths"),
                 **kwargs
             )
             
             return [TextContent(
                 type="text",
-                text=self._format_communication_results(results)
+                text=self._render_results(
+                    arguments, functools.partial(self._format_bundle_results, analysis), results
+                )
             )]
             
         except CodeMaatError as e:
             return [TextContent(
                 type="text",
-                text=f"Error running communication analysis: {str(e)}"
+                text=f"Error analyzing repository: {str(e)}"
             )]
     
-    def _format_coupling_results(self, results: List[Dict[str, Any]]) -> str:
-        """Format coupling analysis results."""
+    def _render_results(self, arguments: Dict[str, Any], formatter, results, *args) -> str:
+        """Render results in the requested output_format; markdown uses formatter."""
+        output_format = arguments.get("output_format", "markdown")
+        if output_format == "json":
+            return _rows_to_json(results)
+        if output_format == "csv":
+            return _rows_to_csv(results)
+        return formatter(results, *args)
+    
+    def _render_bundle(self, arguments: Dict[str, Any], bundle: Dict[str, List[Dict[str, Any]]]) -> str:
+        """Render bundle results in the requested output_format."""
+        output_format = arguments.get("output_format", "markdown")
+        if output_format == "json":
+            return _rows_to_json(bundle)
+        if output_format == "csv":
+            return "\n".join(
+                f"# {analysis}\n{_rows_to_csv(results)}"
+                for analysis, results in bundle.items()
+            )
+        return "\n\n".join(
+            self._format_bundle_results(analysis, results)
+            for analysis, results in bundle.items()
+        )
+    
+    def _format_bundle_results(self, analysis: str, results: List[Dict[str, Any]]) -> str:
+        """Format the results of one analysis in a bundle."""
+        formatters = {
+            "coupling": self._format_coupling_results,
+            "summary": self._format_summary_results,
+            "authors": self._format_authors_results,
+            "age": self._format_age_results,
+            "entity-effort": self._format_entity_effort_results,
+            "communication": self._format_communication_results
+        }
+        
+        if analysis in formatters:
+            return formatters[analysis](results)
+        if analysis in ("entity-churn", "author-churn", "abs-churn"):
+            return self._format_churn_results(results, analysis)
+        
         if not results:
+            return f"# {analysis.title()} Results\n\nNo results found."
+        return f"# {analysis.title()} Results\n\n```json\n{json.dumps(results, indent=2)}\n```"
+    
+    def _format_coupling_results(self, results: Iterable[Dict[str, Any]]) -> str:
+        """Format coupling analysis results."""
+        results = _peek_rows(results)
+        if results is None:
             return "No coupling relationships found."
         
-        output = ["# Logical Coupling Analysis Results\n"]
-        output.append("Modules that tend to change together:\n")
+        output = io.StringIO()
+        output.write("# Logical Coupling Analysis Results\n")
+        output.write("\nModules that tend to change together:\n")
         
         for item in results:
-            entity = item.get("entity", "")
-            coupled = item.get("coupled", "")
-            degree = item.get("degree", 0)
-            avg_revs = item.get("average-revs", 0)
+            entity, coupled, degree, avg_revs = _COUPLING_FIELDS(item)
             
-            output.append(f"- **{entity}** ↔ **{coupled}**")
-            output.append(f"  - Coupling: {degree}%")
-            output.append(f"  - Average revisions: {avg_revs}")
-            output.append("")
+            output.write(
+                f"\n- **{entity}** ↔ **{coupled}**"
+                f"\n  - Coupling: {degree}%"
+                f"\n  - Average revisions: {avg_revs}\n"
+            )
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_summary_results(self, results: List[Dict[str, Any]]) -> str:
+    def _format_summary_results(self, results: Iterable[Dict[str, Any]]) -> str:
         """Format summary analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return "No summary data available."
         
-        output = ["# Repository Summary\n"]
+        output = io.StringIO()
+        output.write("# Repository Summary\n")
         
         for item in results:
-            statistic = item.get("statistic", "")
-            value = item.get("value", "")
-            output.append(f"- **{statistic.replace('-', ' ').title()}**: {value}")
+            statistic, value = _SUMMARY_FIELDS(item)
+            output.write(f"\n- **{statistic.replace('-', ' ').title()}**: {value}")
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_authors_results(self, results: List[Dict[str, Any]]) -> str:
+    def _format_authors_results(self, results: Iterable[Dict[str, Any]]) -> str:
         """Format authors analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return "No author data found."
         
-        output = ["# Author Analysis Results\n"]
-        output.append("Modules with multiple developers:\n")
+        output = io.StringIO()
+        output.write("# Author Analysis Results\n")
+        output.write("\nModules with multiple developers:\n")
         
         for item in results:
-            entity = item.get("entity", "")
-            n_authors = item.get("n-authors", 0)
-            n_revs = item.get("n-revs", 0)
+            entity, n_authors, n_revs = _AUTHORS_FIELDS(item)
             
-            output.append(f"- **{entity}**")
-            output.append(f"  - Authors: {n_authors}")
-            output.append(f"  - Revisions: {n_revs}")
-            output.append("")
+            output.write(
+                f"\n- **{entity}**"
+                f"\n  - Authors: {n_authors}"
+                f"\n  - Revisions: {n_revs}\n"
+            )
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_churn_results(self, results: List[Dict[str, Any]], churn_type: str) -> str:
+    def _format_churn_results(self, results: Iterable[Dict[str, Any]], churn_type: str) -> str:
         """Format churn analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return f"No {churn_type} data found."
         
-        output = [f"# {churn_type.replace('-', ' ').title()} Analysis Results\n"]
+        output = io.StringIO()
+        output.write(f"# {churn_type.replace('-', ' ').title()} Analysis Results\n")
         
+        label_field = _CHURN_LABEL_FIELDS.get(churn_type)
+        if label_field is None:
+            output.write("\n" * sum(1 for _ in results))
+            return output.getvalue()
+        
+        churn_fields = _field_getter((label_field, ""), ("added", 0), ("deleted", 0))
         for item in results:
-            if churn_type == "entity-churn":
-                entity = item.get("entity", "")
-                added = item.get("added", 0)
-                deleted = item.get("deleted", 0)
-                
-                output.append(f"- **{entity}**")
-                output.append(f"  - Added: {added} lines")
-                output.append(f"  - Deleted: {deleted} lines")
-                
-            elif churn_type == "author-churn":
-                author = item.get("author", "")
-                added = item.get("added", 0)
-                deleted = item.get("deleted", 0)
-                
-                output.append(f"- **{author}**")
-                output.append(f"  - Added: {added} lines")
-                output.append(f"  - Deleted: {deleted} lines")
-                
-            elif churn_type == "abs-churn":
-                date = item.get("date", "")
-                added = item.get("added", 0)
-                deleted = item.get("deleted", 0)
-                
-                output.append(f"- **{date}**")
-                output.append(f"  - Added: {added} lines")
-                output.append(f"  - Deleted: {deleted} lines")
+            label, added, deleted = churn_fields(item)
             
-            output.append("")
+            output.write(
+                f"\n- **{label}**"
+                f"\n  - Added: {added} lines"
+                f"\n  - Deleted: {deleted} lines\n"
+            )
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_age_results(self, results: List[Dict[str, Any]]) -> str:
+    def _format_age_results(self, results: Iterable[Dict[str, Any]]) -> str:
         """Format age analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return "No age data found."
         
-        output = ["# Code Age Analysis Results\n"]
-        output.append("Age of modules (months since last change):\n")
+        output = io.StringIO()
+        output.write("# Code Age Analysis Results\n")
+        output.write("\nAge of modules (months since last change):\n")
         
         for item in results:
-            entity = item.get("entity", "")
-            age_months = item.get("age-months", 0)
+            entity, age_months = _AGE_FIELDS(item)
             
-            output.append(f"- **{entity}**: {age_months} months old")
+            output.write(f"\n- **{entity}**: {age_months} months old")
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_entity_effort_results(self, results: List[Dict[str, Any]]) -> str:
+    def _format_entity_effort_results(self, results: Iterable[Dict[str, Any]]) -> str:
         """Format entity effort analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return "No entity effort data found."
         
-        output = ["# Entity Effort Analysis Results\n"]
-        output.append("Developer effort per module:\n")
+        output = io.StringIO()
+        output.write("# Entity Effort Analysis Results\n")
+        output.write("\nDeveloper effort per module:\n")
         
         for item in results:
-            entity = item.get("entity", "")
-            author = item.get("author", "")
-            author_revs = item.get("author-revs", 0)
-            total_revs = item.get("total-revs", 0)
+            entity, author, author_revs, total_revs = _ENTITY_EFFORT_FIELDS(item)
             
             percentage = (author_revs / total_revs * 100) if total_revs > 0 else 0
             
-            output.append(f"- **{entity}** → **{author}**")
-            output.append(f"  - Author revisions: {author_revs}/{total_revs} ({percentage:.1f}%)")
-            output.append("")
+            output.write(
+                f"\n- **{entity}** → **{author}**"
+                f"\n  - Author revisions: {author_revs}/{total_revs} ({percentage:.1f}%)\n"
+            )
         
-        return "\n".join(output)
+        return output.getvalue()
     
-    def _format_communication_results(self, results: List[Dict[str, Any]]) -> str:
+    def _format_communication_results(self, results: Iterable[Dict[str, Any]]) -> str:
         """Format communication analysis results."""
-        if not results:
+        results = _peek_rows(results)
+        if results is None:
             return "No communication data found."
         
-        output = ["# Communication Analysis Results\n"]
-        output.append("Developer communication patterns:\n")
+        output = io.StringIO()
+        output.write("# Communication Analysis Results\n")
+        output.write("\nDeveloper communication patterns:\n")
         
         for item in results:
-            author = item.get("author", "")
-            peer = item.get("peer", "")
-            shared = item.get("shared", 0)
+            author, peer, shared = _COMMUNICATION_FIELDS(item)
             
-            output.append(f"- **{author}** ↔ **{peer}**")
-            output.append(f"  - Shared entities: {shared}")
-            output.append("")
+            output.write(
+                f"\n- **{author}** ↔ **{peer}**"
+                f"\n  - Shared entities: {shared}\n"
+            )
         
-        return "\n".join(output)
\ No newline at end of file
+        return output.getvalue()
+
+
+# Tools and argument validators shared by all AnalysisTools instances
+_TOOLS = AnalysisTools._build_tools()
+_VALIDATORS = {tool.name: _compile_validator(tool.inputSchema) for tool in _TOOLS}
@@ -4,43 +4,47 @@ Startup script for Code Maat MCP Server.
 This script ensures proper error handling and logging.
 """
 
+import atexit
 import sys
 import os
 import logging
-import asyncio
+import logging.handlers
+import queue
 
-# Add the source directory to Python path
+# Run as a script, Python puts this directory on sys.path first, so the
+# server is importable as the src package without touching sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = os.path.join(current_dir, "src")
-sys.path.insert(0, current_dir)
-sys.path.insert(0, src_dir)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(current_dir, "mcp_server.log")),
-        logging.StreamHandler(sys.stderr)
-    ]
-)
+
+# Configure logging. Records are only queued by the logging call; a
+# listener thread does the file and stderr writes, so they never block
+# the event loop.
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler(os.path.join(current_dir, "mcp_server.log")),
+    logging.StreamHandler(sys.stderr)
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+# Flushes the queued records before the interpreter exits
+atexit.register(log_listener.stop)
+
+# Added directly rather than through basicConfig, which would give the
+# queue handler a formatter of its own and format every record twice
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
 logger = logging.getLogger(__name__)
 
-async def main():
+def main():
     """Main entry point for the MCP server."""
     try:
-        logger.info("Starting Code Maat MCP Server...")
-        
-        # Import and start the server
-        try:
-            from src.mcp_server import CodeMaatMCPServer
-        except ImportError:
-            # Fallback for different import contexts
-            from mcp_server import CodeMaatMCPServer
-        
-        server = CodeMaatMCPServer()
-        await server.run()
+        from src.mcp_server import main as run_server
+        run_server()
         
     except ImportError as e:
         logger.error(f"Failed to import MCP server: {e}")
@@ -50,4 +54,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -7,11 +7,6 @@ import sys
 import os
 import asyncio
 
-# Add the source directory to Python path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = os.path.join(current_dir, "src")
-sys.path.insert(0, src_dir)
-
 async def test_installation():
     """Test the installation."""
     try:
@@ -19,10 +14,17 @@ async def test_installation():
         
         # Test 1: Import the server
         print("1. Testing server import...")
-        from src.mcp_server import CodeMaatMCPServer
-        server = CodeMaatMCPServer()
+        from src import mcp_server as server
         print("   ✅ Server import successful")
         
+        # The status check blocks on Java probes, so it runs in a thread
+        # while the JAR and the tool list are checked here
+        loop = asyncio.get_running_loop()
+        status_future = loop.run_in_executor(
+            None, asyncio.run, server.utility_tools.check_code_maat_status({})
+        )
+        tools = server.analysis_tools.get_tools()
+        
         # Test 2: Check Code Maat JAR
         print("2. Testing Code Maat JAR...")
         jar_path = server.analysis_tools.wrapper.config.jar_path
@@ -34,7 +36,7 @@ async def test_installation():
         
         # Test 3: Test utility tools
         print("3. Testing utility tools...")
-        result = await server.utility_tools.check_code_maat_status({})
+        result = await status_future
         if "✅" in result[0].text:
             print("   ✅ Code Maat status check passed")
         else:
@@ -43,7 +45,6 @@ async def test_installation():
         
         # Test 4: Test analysis tools
         print("4. Testing analysis tools...")
-        tools = server.analysis_tools.get_tools()
         if len(tools) >= 7:
             print(f"   ✅ Found {len(tools)} analysis tools")
         else:
@@ -0,0 +1,13 @@
+"""
+Fixtures shared by all test packages.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mock_jar_file(tmp_path_factory):
+    """Create mock JAR file, once per session; only its path matters."""
+    jar_path = tmp_path_factory.mktemp("jar") / "code-maat.jar"
+    jar_path.touch()
+    return str(jar_path)
@@ -0,0 +1 @@
+# Smoke tests against the installed server
\ No newline at end of file
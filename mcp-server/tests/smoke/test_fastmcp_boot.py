@@ -0,0 +1,48 @@
+"""
+Smoke tests verifying the FastMCP-based Code Maat server boots correctly.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.code_maat_wrapper import CodeMaatWrapper, CodeMaatError
+
+
+@pytest.fixture(scope="session")
+def mcp_module(mock_jar_file):
+    """Import the server once per session, accepting the mock JAR as the configured one."""
+    with patch('src.code_maat_wrapper._resolve_jar', return_value=mock_jar_file):
+        import src.mcp_server as module
+    return module
+
+
+def test_server_imports(mcp_module):
+    """Test the FastMCP server and its tool groups are created."""
+    assert hasattr(mcp_module, "mcp")
+    assert hasattr(mcp_module, "analysis_tools")
+    assert hasattr(mcp_module, "utility_tools")
+
+
+def test_jar_found():
+    """Test the configured Code Maat JAR exists, once it is built."""
+    try:
+        wrapper = CodeMaatWrapper()
+    except CodeMaatError as e:
+        pytest.skip(f"Code Maat JAR not built: {e}")
+    assert os.path.exists(wrapper.config.jar_path)
+
+
+async def test_tools_registered(mcp_module):
+    """Test the MCP decorators registered the tools."""
+    names = {tool.name for tool in await mcp_module.mcp.list_tools()}
+
+    assert {"run_coupling_analysis", "generate_git_log", "check_code_maat_status"} <= names
+
+
+async def test_resources_registered(mcp_module):
+    """Test the MCP decorators registered the resources."""
+    uris = {str(resource.uri) for resource in await mcp_module.mcp.list_resources()}
+
+    assert {"code-maat://config", "code-maat://help"} <= uris
@@ -0,0 +1,41 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+import json
+
+import pytest
+
+from src.code_maat_wrapper import CodeMaatWrapper
+
+# xdist group per test module, so that with --dist=loadgroup the
+# module-scoped fixtures are built once on a single worker
+_XDIST_GROUPS = {
+    "test_analysis_tools.py": "analysis",
+    "test_code_maat_wrapper.py": "wrapper",
+    "test_utility_tools.py": "utility",
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    """Put the tests of each module into that module's xdist group."""
+    for item in items:
+        group = _XDIST_GROUPS.get(item.path.name)
+        if group is not None:
+            item.add_marker(pytest.mark.xdist_group(group))
+
+
+@pytest.fixture(scope="module")
+def wrapper_factory(tmp_path_factory, mock_jar_file):
+    """Return a callable handing out one wrapper built for the whole module.
+
+    The wrapper is shared, so only tests that leave it untouched should use it.
+    """
+    config_file = tmp_path_factory.mktemp("config") / "config.json"
+    config_file.write_text(json.dumps({"code_maat": {"jar_path": mock_jar_file}}))
+    wrapper = CodeMaatWrapper(config_path=str(config_file))
+
+    def factory():
+        return wrapper
+
+    return factory
@@ -2,29 +2,142 @@
 Unit tests for MCP analysis tools.
 """
 
+import asyncio
+import importlib.util
+import json
+import threading
+
 import pytest
+from jsonschema import Draft202012Validator
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from src.tools.analysis_tools import AnalysisTools
 from src.code_maat_wrapper import CodeMaatError
 
 
+# Shape every tool inputSchema must have, on top of being valid JSON Schema
+_INPUT_SCHEMA_SHAPE = Draft202012Validator({
+    "type": "object",
+    "required": ["type", "properties", "required"],
+    "properties": {
+        "type": {"const": "object"},
+        "properties": {"type": "object"},
+        "required": {"type": "array", "items": {"type": "string"}}
+    }
+})
+
+# Rows fed to the formatter benchmarks, about the size of a large repository
+_BENCH_ROWS = 10_000
+
+# Formatter benchmarks run only where pytest-benchmark is installed
+_benchmark = pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None,
+    reason="pytest-benchmark is not installed"
+)
+
+# Substrings the rendered coupling and summary rows must contain
+_COUPLING_EXPECTED = ("Logical Coupling Analysis Results", "file1.java", "file2.java", "78%", "10")
+_SUMMARY_EXPECTED = ("Repository Summary", "Number Of Commits**: 919", "Number Of Authors**: 15")
+
+# (tool method, arguments, wrapper results, substrings of the rendered text)
+_SUCCESS_CASES = [
+    pytest.param(
+        "run_coupling_analysis",
+        {"log_file": "test.log", "vcs": "git2", "min_coupling": 50},
+        [{"entity": "file1.java", "coupled": "file2.java", "degree": 78, "average-revs": 10}],
+        ["file1.java", "file2.java", "78%"],
+        id="coupling"
+    ),
+    pytest.param(
+        "run_summary_analysis",
+        {"log_file": "test.log", "vcs": "git2"},
+        [
+            {"statistic": "number-of-commits", "value": 919},
+            {"statistic": "number-of-entities", "value": 730}
+        ],
+        ["Repository Summary", "Number Of Commits**: 919", "Number Of Entities**: 730"],
+        id="summary"
+    ),
+    pytest.param(
+        "run_authors_analysis",
+        {"log_file": "test.log", "vcs": "git2", "min_revs": 5, "rows": 20},
+        [{"entity": "InfoUtils.java", "n-authors": 12, "n-revs": 60}],
+        ["Author Analysis Results", "InfoUtils.java", "Authors: 12", "Revisions: 60"],
+        id="authors"
+    ),
+    pytest.param(
+        "run_churn_analysis",
+        {"log_file": "test.log", "vcs": "git2", "churn_type": "entity-churn"},
+        [{"entity": "file1.java", "added": 150, "deleted": 30}],
+        ["Entity Churn Analysis Results", "file1.java", "Added: 150 lines", "Deleted: 30 lines"],
+        id="entity-churn"
+    ),
+    pytest.param(
+        "run_churn_analysis",
+        {"log_file": "test.log", "vcs": "git2", "churn_type": "author-churn"},
+        [{"author": "John Doe", "added": 1500, "deleted": 300}],
+        ["Author Churn Analysis Results", "John Doe", "Added: 1500 lines", "Deleted: 300 lines"],
+        id="author-churn"
+    ),
+    pytest.param(
+        "run_age_analysis",
+        {"log_file": "test.log", "vcs": "git2", "age_time_now": "2024-01-01"},
+        [
+            {"entity": "old_file.java", "age-months": 24},
+            {"entity": "new_file.java", "age-months": 2}
+        ],
+        [
+            "Code Age Analysis Results",
+            "old_file.java**: 24 months old",
+            "new_file.java**: 2 months old"
+        ],
+        id="age"
+    ),
+    pytest.param(
+        "run_entity_effort_analysis",
+        {"log_file": "test.log", "vcs": "git2"},
+        [{"entity": "file1.java", "author": "John", "author-revs": 8, "total-revs": 10}],
+        ["Entity Effort Analysis Results", "file1.java", "John", "8/10 (80.0%)"],
+        id="entity-effort"
+    ),
+    pytest.param(
+        "run_communication_analysis",
+        {"log_file": "test.log", "vcs": "git2", "min_shared_revs": 5},
+        [{"author": "Alice", "peer": "Bob", "shared": 15}],
+        ["Communication Analysis Results", "Alice", "Bob", "Shared entities: 15"],
+        id="communication"
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def analysis_tools():
+    """Create AnalysisTools instance with mocked wrapper, once for the module."""
+    with patch('src.tools.analysis_tools.CodeMaatWrapper'):
+        return AnalysisTools()
+
+
+@pytest.fixture(scope="module")
+def tools_list(analysis_tools):
+    """The analysis tool list, fetched once for the schema tests."""
+    return analysis_tools.get_tools()
+
+
+@pytest.fixture(autouse=True)
+def reset_wrapper(analysis_tools):
+    """Clear what a test configured on the shared mocked wrapper."""
+    yield
+    analysis_tools.wrapper.reset_mock(return_value=True, side_effect=True)
+
+
 class TestAnalysisTools:
     """Test AnalysisTools class."""
     
-    @pytest.fixture
-    def analysis_tools(self):
-        """Create AnalysisTools instance with mocked wrapper."""
-        with patch('src.tools.analysis_tools.CodeMaatWrapper'):
-            return AnalysisTools()
-    
-    def test_get_tools(self, analysis_tools):
+    def test_get_tools(self, tools_list):
         """Test getting list of tools."""
-        tools = analysis_tools.get_tools()
-        
-        assert len(tools) > 0
+        assert len(tools_list) > 0
         
-        tool_names = [tool.name for tool in tools]
+        tool_names = [tool.name for tool in tools_list]
         expected_tools = [
             "run_coupling_analysis",
             "run_summary_analysis", 
@@ -32,48 +145,41 @@ class TestAnalysisTools:
             "run_churn_analysis",
             "run_age_analysis",
             "run_entity_effort_analysis",
-            "run_communication_analysis"
+            "run_communication_analysis",
+            "run_analysis_bundle",
+            "run_all_analyses",
+            "analyze_repository"
         ]
         
         for expected_tool in expected_tools:
             assert expected_tool in tool_names
     
-    def test_tool_schemas(self, analysis_tools):
+    def test_get_tools_cached(self, analysis_tools):
+        """Test the tool list is built once and then reused."""
+        assert analysis_tools.get_tools() is analysis_tools.get_tools()
+    
+    def test_tool_schemas(self, tools_list):
         """Test that all tools have proper schemas."""
-        tools = analysis_tools.get_tools()
-        
-        for tool in tools:
+        for tool in tools_list:
             assert tool.name
             assert tool.description
-            assert tool.inputSchema
-            assert "type" in tool.inputSchema
-            assert "properties" in tool.inputSchema
-            assert "required" in tool.inputSchema
+            Draft202012Validator.check_schema(tool.inputSchema)
+            _INPUT_SCHEMA_SHAPE.validate(tool.inputSchema)
+            assert set(tool.inputSchema["required"]) <= set(tool.inputSchema["properties"])
     
-    @pytest.mark.asyncio
-    async def test_run_coupling_analysis_success(self, analysis_tools):
-        """Test successful coupling analysis."""
-        # Mock successful wrapper response
-        mock_results = [
-            {"entity": "file1.java", "coupled": "file2.java", "degree": 78, "average-revs": 10}
-        ]
+    @pytest.mark.parametrize("method,arguments,mock_results,expected", _SUCCESS_CASES)
+    async def test_run_analysis_success(self, analysis_tools, method, arguments, mock_results, expected):
+        """Test each analysis tool renders the wrapper's results."""
         analysis_tools.wrapper.run_analysis.return_value = mock_results
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "min_coupling": 50
-        }
-        
-        result = await analysis_tools.run_coupling_analysis(arguments)
+        result = await getattr(analysis_tools, method)(arguments)
         
         assert len(result) == 1
         assert result[0].type == "text"
-        assert "file1.java" in result[0].text
-        assert "file2.java" in result[0].text
-        assert "78%" in result[0].text
+        text = result[0].text
+        for needle in expected:
+            assert needle in text
     
-    @pytest.mark.asyncio
     async def test_run_coupling_analysis_error(self, analysis_tools):
         """Test coupling analysis with error."""
         # Mock error from wrapper
@@ -91,167 +197,169 @@ class TestAnalysisTools:
         assert "Error running coupling analysis" in result[0].text
         assert "Test error" in result[0].text
     
-    @pytest.mark.asyncio
-    async def test_run_summary_analysis_success(self, analysis_tools):
-        """Test successful summary analysis."""
-        mock_results = [
-            {"statistic": "number-of-commits", "value": 919},
-            {"statistic": "number-of-entities", "value": 730}
-        ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
+    async def test_run_analysis_bundle_success(self, analysis_tools):
+        """Test a bundle formats each analysis with its own formatter."""
+        analysis_tools.wrapper.run_analysis_bundle.return_value = {
+            "summary": [{"statistic": "number-of-commits", "value": "42"}],
+            "revisions": [{"entity": "file1.java", "n-revs": 7}]
+        }
         
         arguments = {
             "log_file": "test.log",
-            "vcs": "git2"
+            "vcs": "git2",
+            "analyses": ["summary", "revisions"],
+            "min_revs": 3
         }
         
-        result = await analysis_tools.run_summary_analysis(arguments)
+        result = await analysis_tools.run_analysis_bundle(arguments)
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Repository Summary" in result[0].text
-        assert "Number Of Commits**: 919" in result[0].text
-        assert "Number Of Entities**: 730" in result[0].text
+        analysis_tools.wrapper.run_analysis_bundle.assert_called_once_with(
+            "test.log", "git2", ["summary", "revisions"], use_cache=True, min_revs=3
+        )
+        text = result[0].text
+        assert "Repository Summary" in text
+        assert "Number Of Commits" in text
+        assert "# Revisions Results" in text
+        assert '"n-revs": 7' in text
     
-    @pytest.mark.asyncio
-    async def test_run_authors_analysis_success(self, analysis_tools):
-        """Test successful authors analysis."""
-        mock_results = [
-            {"entity": "InfoUtils.java", "n-authors": 12, "n-revs": 60}
-        ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
+    async def test_run_analysis_bundle_error(self, analysis_tools):
+        """Test bundle errors are reported as text."""
+        analysis_tools.wrapper.run_analysis_bundle.side_effect = CodeMaatError("Unsupported analysis: bogus")
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "min_revs": 5,
-            "rows": 20
-        }
+        arguments = {"log_file": "test.log", "vcs": "git2", "analyses": ["bogus"]}
+        result = await analysis_tools.run_analysis_bundle(arguments)
         
-        result = await analysis_tools.run_authors_analysis(arguments)
-        
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Author Analysis Results" in result[0].text
-        assert "InfoUtils.java" in result[0].text
-        assert "Authors: 12" in result[0].text
-        assert "Revisions: 60" in result[0].text
+        assert "Error running analysis bundle" in result[0].text
     
-    @pytest.mark.asyncio
-    async def test_run_churn_analysis_entity_churn(self, analysis_tools):
-        """Test entity churn analysis."""
+    async def test_output_format_json(self, analysis_tools):
+        """Test output_format json returns the raw rows."""
         mock_results = [
-            {"entity": "file1.java", "added": 150, "deleted": 30}
+            {"entity": "file1.java", "coupled": "file2.java", "degree": 78, "average-revs": 10}
         ]
         analysis_tools.wrapper.run_analysis.return_value = mock_results
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "churn_type": "entity-churn"
-        }
-        
-        result = await analysis_tools.run_churn_analysis(arguments)
+        arguments = {"log_file": "test.log", "vcs": "git2", "output_format": "json"}
+        result = await analysis_tools.run_coupling_analysis(arguments)
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Entity Churn Analysis Results" in result[0].text
-        assert "file1.java" in result[0].text
-        assert "Added: 150 lines" in result[0].text
-        assert "Deleted: 30 lines" in result[0].text
+        assert json.loads(result[0].text) == mock_results
     
-    @pytest.mark.asyncio
-    async def test_run_churn_analysis_author_churn(self, analysis_tools):
-        """Test author churn analysis."""
-        mock_results = [
-            {"author": "John Doe", "added": 1500, "deleted": 300}
+    async def test_output_format_csv(self, analysis_tools):
+        """Test output_format csv returns a header line and one line per row."""
+        analysis_tools.wrapper.run_analysis.return_value = [
+            {"entity": "file1.java", "n-authors": 3, "n-revs": 25},
+            {"entity": "a, b.java", "n-authors": 1, "n-revs": 2}
         ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "churn_type": "author-churn"
-        }
+        arguments = {"log_file": "test.log", "vcs": "git2", "output_format": "csv"}
+        result = await analysis_tools.run_authors_analysis(arguments)
         
-        result = await analysis_tools.run_churn_analysis(arguments)
+        assert result[0].text == 'entity,n-authors,n-revs\nfile1.java,3,25\n"a, b.java",1,2\n'
+    
+    async def test_output_format_unsupported(self, analysis_tools):
+        """Test an unknown output_format is reported as an error."""
+        analysis_tools.wrapper.run_analysis.return_value = []
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Author Churn Analysis Results" in result[0].text
-        assert "John Doe" in result[0].text
-        assert "Added: 1500 lines" in result[0].text
-        assert "Deleted: 300 lines" in result[0].text
+        arguments = {"log_file": "test.log", "vcs": "git2", "output_format": "xml"}
+        result = await analysis_tools.run_summary_analysis(arguments)
+        
+        assert "Unsupported output format: xml" in result[0].text
     
-    @pytest.mark.asyncio
-    async def test_run_age_analysis_success(self, analysis_tools):
-        """Test successful age analysis."""
-        mock_results = [
-            {"entity": "old_file.java", "age-months": 24},
-            {"entity": "new_file.java", "age-months": 2}
-        ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
+    async def test_bundle_output_format_json(self, analysis_tools):
+        """Test a bundle in JSON maps each analysis to its rows."""
+        bundle = {"summary": [{"statistic": "number-of-commits", "value": 42}], "age": []}
+        analysis_tools.wrapper.run_analysis_bundle.return_value = bundle
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "age_time_now": "2024-01-01"
+        arguments = {"log_file": "test.log", "vcs": "git2", "analyses": ["summary", "age"],
+                     "output_format": "json"}
+        result = await analysis_tools.run_analysis_bundle(arguments)
+        
+        assert json.loads(result[0].text) == bundle
+    
+    async def test_run_all_analyses(self, analysis_tools):
+        """Test all standard analyses run as one bundle."""
+        analysis_tools.wrapper.run_analysis_bundle.return_value = {
+            "summary": [{"statistic": "number-of-commits", "value": 42}],
+            "abs-churn": [{"date": "2024-01-01", "added": 10, "deleted": 2}]
         }
         
-        result = await analysis_tools.run_age_analysis(arguments)
+        arguments = {"log_file": "test.log", "vcs": "git2", "min_revs": 3}
+        result = await analysis_tools.run_all_analyses(arguments)
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Code Age Analysis Results" in result[0].text
-        assert "old_file.java**: 24 months old" in result[0].text
-        assert "new_file.java**: 2 months old" in result[0].text
+        analysis_tools.wrapper.run_analysis_bundle.assert_called_once_with(
+            "test.log", "git2",
+            ["summary", "authors", "coupling", "age", "entity-effort", "communication", "abs-churn"],
+            use_cache=True, min_revs=3
+        )
+        assert "Repository Summary" in result[0].text
+        assert "- **2024-01-01**" in result[0].text
     
-    @pytest.mark.asyncio
-    async def test_run_entity_effort_analysis_success(self, analysis_tools):
-        """Test successful entity effort analysis."""
-        mock_results = [
-            {"entity": "file1.java", "author": "John", "author-revs": 8, "total-revs": 10}
-        ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
+    @pytest.mark.parametrize("arguments,message", [
+        ({"vcs": "git2"}, "Missing required argument: log_file"),
+        ({"log_file": "test.log", "vcs": "git2", "min_coupling": "50"},
+         "Invalid min_coupling: expected integer, got '50'"),
+        ({"log_file": "test.log", "vcs": "git2", "rows": True}, "Invalid rows: expected integer"),
+        ({"log_file": "test.log", "vcs": "cvs"}, "Unsupported vcs: cvs")
+    ])
+    async def test_invalid_arguments_rejected_before_running(self, analysis_tools, arguments, message):
+        """Test arguments that do not match the tool schema never reach Code Maat."""
+        tool = (analysis_tools.run_authors_analysis if "rows" in arguments
+                else analysis_tools.run_coupling_analysis)
+        
+        result = await tool(arguments)
+        
+        assert message in result[0].text
+        analysis_tools.wrapper.run_analysis.assert_not_called()
+    
+    async def test_handler_options_passed_to_wrapper(self, analysis_tools):
+        """Test defaults are filled in and unset optional arguments are left out."""
+        analysis_tools.wrapper.run_analysis.return_value = []
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2"
+        await analysis_tools.run_coupling_analysis({"log_file": "test.log", "vcs": "git2"})
+        await analysis_tools.run_churn_analysis(
+            {"log_file": "test.log", "vcs": "git2", "churn_type": "abs-churn", "rows": 10}
+        )
+        
+        coupling, churn = analysis_tools.wrapper.run_analysis.call_args_list
+        assert coupling.kwargs == {
+            "log_file": "test.log", "vcs": "git2", "use_cache": True, "analysis": "coupling",
+            "min_coupling": 30, "max_coupling": 100, "min_revs": 5, "max_changeset_size": 30
+        }
+        assert churn.kwargs == {
+            "log_file": "test.log", "vcs": "git2", "use_cache": True, "analysis": "abs-churn",
+            "min_revs": 5, "rows": 10
         }
+    
+    async def test_no_cache_bypasses_cached_results(self, analysis_tools):
+        """Test no_cache asks the wrapper for a fresh run."""
+        analysis_tools.wrapper.run_analysis.return_value = []
         
-        result = await analysis_tools.run_entity_effort_analysis(arguments)
+        await analysis_tools.run_summary_analysis({"log_file": "test.log", "vcs": "git2"})
+        await analysis_tools.run_summary_analysis({"log_file": "test.log", "vcs": "git2", "no_cache": True})
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Entity Effort Analysis Results" in result[0].text
-        assert "file1.java" in result[0].text
-        assert "John" in result[0].text
-        assert "8/10 (80.0%)" in result[0].text
+        first, second = analysis_tools.wrapper.run_analysis.call_args_list
+        assert first.kwargs["use_cache"] is True
+        assert second.kwargs["use_cache"] is False
     
-    @pytest.mark.asyncio
-    async def test_run_communication_analysis_success(self, analysis_tools):
-        """Test successful communication analysis."""
-        mock_results = [
-            {"author": "Alice", "peer": "Bob", "shared": 15}
-        ]
-        analysis_tools.wrapper.run_analysis.return_value = mock_results
+    async def test_analyses_run_concurrently(self, analysis_tools):
+        """Test independent analyses do not serialize on the event loop."""
+        # Both calls must be inside run_analysis at the same time to pass
+        barrier = threading.Barrier(2, timeout=5)
         
-        arguments = {
-            "log_file": "test.log",
-            "vcs": "git2",
-            "min_shared_revs": 5
-        }
+        def run_analysis(**kwargs):
+            barrier.wait()
+            return []
         
-        result = await analysis_tools.run_communication_analysis(arguments)
+        analysis_tools.wrapper.run_analysis.side_effect = run_analysis
+        arguments = {"log_file": "test.log", "vcs": "git2"}
         
-        assert len(result) == 1
-        assert result[0].type == "text"
-        assert "Communication Analysis Results" in result[0].text
-        assert "Alice" in result[0].text
-        assert "Bob" in result[0].text
-        assert "Shared entities: 15" in result[0].text
+        coupling, summary = await asyncio.gather(
+            analysis_tools.run_coupling_analysis(arguments),
+            analysis_tools.run_summary_analysis(arguments)
+        )
+        
+        assert "No coupling relationships found" in coupling[0].text
+        assert "No summary data available" in summary[0].text
     
-    @pytest.mark.asyncio
     async def test_empty_results(self, analysis_tools):
         """Test handling of empty results."""
         analysis_tools.wrapper.run_analysis.return_value = []
@@ -267,6 +375,25 @@ class TestAnalysisTools:
         assert result[0].type == "text"
         assert "No coupling relationships found" in result[0].text
     
+    async def test_analyze_repository(self, analysis_tools):
+        """Test a repository analysis is handed to the wrapper and rendered."""
+        analysis_tools.wrapper.analyze_repository.return_value = [
+            {"statistic": "number-of-commits", "value": 919}
+        ]
+        
+        result = await analysis_tools.analyze_repository({
+            "repo_path": "/test/repo",
+            "analysis": "summary",
+            "exclude_paths": ["vendor/"],
+            "rows": 10
+        })
+        
+        analysis_tools.wrapper.analyze_repository.assert_called_once_with(
+            "/test/repo", "summary",
+            format_type="git2", after_date=None, exclude_paths=["vendor/"], rows=10
+        )
+        assert "Number Of Commits**: 919" in result[0].text
+    
     def test_format_coupling_results_empty(self, analysis_tools):
         """Test formatting empty coupling results."""
         result = analysis_tools._format_coupling_results([])
@@ -280,11 +407,8 @@ class TestAnalysisTools:
         
         result = analysis_tools._format_coupling_results(results)
         
-        assert "Logical Coupling Analysis Results" in result
-        assert "file1.java" in result
-        assert "file2.java" in result
-        assert "78%" in result
-        assert "10" in result
+        for needle in _COUPLING_EXPECTED:
+            assert needle in result
     
     def test_format_summary_results_with_data(self, analysis_tools):
         """Test formatting summary results with data."""
@@ -295,6 +419,60 @@ class TestAnalysisTools:
         
         result = analysis_tools._format_summary_results(results)
         
-        assert "Repository Summary" in result
-        assert "Number Of Commits**: 919" in result
-        assert "Number Of Authors**: 15" in result
\ No newline at end of file
+        for needle in _SUMMARY_EXPECTED:
+            assert needle in result
+    
+    @_benchmark
+    @pytest.mark.benchmark(group="format")
+    def test_format_coupling_bench(self, benchmark, analysis_tools):
+        """Benchmark formatting a large coupling result."""
+        rows = [
+            {"entity": f"f{i}.java", "coupled": f"g{i}.java", "degree": 50 + i % 50, "average-revs": i}
+            for i in range(_BENCH_ROWS)
+        ]
+        
+        result = benchmark(analysis_tools._format_coupling_results, rows)
+        
+        assert f"**f{_BENCH_ROWS - 1}.java** ↔ **g{_BENCH_ROWS - 1}.java**" in result
+    
+    @_benchmark
+    @pytest.mark.benchmark(group="format")
+    def test_format_summary_bench(self, benchmark, analysis_tools):
+        """Benchmark formatting a large summary result."""
+        rows = [{"statistic": f"statistic-{i}", "value": i} for i in range(_BENCH_ROWS)]
+        
+        result = benchmark(analysis_tools._format_summary_results, rows)
+        
+        assert f"Statistic {_BENCH_ROWS - 1}**: {_BENCH_ROWS - 1}" in result
+    
+    def test_format_churn_results_layout(self, analysis_tools):
+        """Test churn results keep a blank line after each row."""
+        results = [
+            {"entity": "a.java", "added": 5, "deleted": 1},
+            {"entity": "b.java", "added": 2, "deleted": 0}
+        ]
+        
+        result = analysis_tools._format_churn_results(results, "entity-churn")
+        
+        assert result == (
+            "# Entity Churn Analysis Results\n\n"
+            "- **a.java**\n  - Added: 5 lines\n  - Deleted: 1 lines\n\n"
+            "- **b.java**\n  - Added: 2 lines\n  - Deleted: 0 lines\n"
+        )
+    
+    def test_format_results_from_generator(self, analysis_tools):
+        """Test formatters accept rows from a generator."""
+        rows = [{"entity": "a.java", "age-months": 3}, {"entity": "b.java", "age-months": 7}]
+        
+        result = analysis_tools._format_age_results(row for row in rows)
+        
+        assert result == analysis_tools._format_age_results(rows)
+        assert "**b.java**: 7 months old" in result
+        assert analysis_tools._format_age_results(iter([])) == "No age data found."
+    
+    def test_format_results_with_missing_fields(self, analysis_tools):
+        """Test rows without some columns are formatted with defaults."""
+        result = analysis_tools._format_coupling_results([{"entity": "file1.java"}])
+        
+        assert "- **file1.java** ↔ ****" in result
+        assert "Coupling: 0%" in result
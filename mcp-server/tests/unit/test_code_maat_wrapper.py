@@ -3,12 +3,60 @@ Unit tests for Code Maat wrapper module.
 """
 
 import pytest
-import tempfile
+import re
+import io
 import os
 import json
+import subprocess
+import sys
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from src.code_maat_wrapper import CodeMaatWrapper, CodeMaatError, CodeMaatConfig
+from src.code_maat_wrapper import (
+    CodeMaatWrapper, CodeMaatWorker, CodeMaatError, CodeMaatConfig, DEFAULT_JAVA_OPTS,
+    MAX_HEAP_MB, _json_loads, _persistent_java_opts
+)
+
+
+# path_exists for wrappers whose configured JAR need not exist
+_ANY_PATH = lambda path: True
+
+# Error messages asserted by more than one test
+_UNSUPPORTED_ANALYSIS_RE = re.compile(r"Unsupported analysis")
+_NOT_A_REPO_RE = re.compile(r"fatal: not a git repository")
+
+
+def fake_popen(stdout, returncode=0):
+    """Build a subprocess.Popen stand-in that streams the given stdout."""
+    proc = MagicMock()
+    proc.__enter__.return_value = proc
+    proc.stdout = io.BytesIO(stdout.encode("utf-8"))
+    proc.wait.return_value = returncode
+    return proc
+
+
+# Speaks the protocol of Code Maat's --serve loop; the output reports the
+# worker's pid so tests can tell whether the process was reused.
+FAKE_WORKER = """
+import json, os, sys, time
+for line in sys.stdin:
+    args = json.loads(line)["args"]
+    if "crash" in args:
+        sys.exit(1)
+    if "hang" in args:
+        time.sleep(30)
+    if "garbage" in args:
+        print("Unknown option: --serve", flush=True)
+        continue
+    if "fail" in args:
+        response = {"ok": False, "error": "Invalid analysis requested"}
+    else:
+        response = {"ok": True, "output": "pid,args\\n%d,%s\\n" % (os.getpid(), " ".join(args))}
+    print(json.dumps(response), flush=True)
+    if "exit-after" in args:
+        sys.exit(0)
+"""
 
 
 class TestCodeMaatConfig:
@@ -20,7 +68,7 @@ class TestCodeMaatConfig:
         
         assert config.jar_path == "/path/to/jar"
         assert config.java_executable == "java"
-        assert config.java_opts == ["-Xmx4g", "-Djava.awt.headless=true", "-Xss512M"]
+        assert config.java_opts == DEFAULT_JAVA_OPTS
     
     def test_custom_initialization(self):
         """Test custom config initialization."""
@@ -34,13 +82,21 @@ class TestCodeMaatConfig:
         assert config.jar_path == "/custom/path"
         assert config.java_executable == "custom-java"
         assert config.java_opts == custom_opts
+    
+    def test_frozen(self):
+        """Test config cannot be changed after creation."""
+        config = CodeMaatConfig(jar_path="/path/to/jar")
+        
+        with pytest.raises(FrozenInstanceError):
+            config.jar_path = "/other/jar"
+        assert hash(config) == hash(CodeMaatConfig(jar_path="/path/to/jar"))
 
 
 class TestCodeMaatWrapper:
     """Test CodeMaatWrapper class."""
     
     @pytest.fixture
-    def temp_config_file(self):
+    def temp_config_file(self, tmp_path):
         """Create temporary config file."""
         config_data = {
             "code_maat": {
@@ -50,205 +106,703 @@ class TestCodeMaatWrapper:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(config_data, f)
-            temp_path = f.name
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps(config_data))
+        return str(config_file)
+    
+    @pytest.fixture
+    def make_wrapper(self, tmp_path):
+        """Build wrappers from a config pointing at a real (empty) JAR file."""
+        jar_file = tmp_path / "code-maat.jar"
+        jar_file.touch()
         
-        yield temp_path
-        os.unlink(temp_path)
+        def make(code_maat=None, server=None):
+            config_file = tmp_path / "config.json"
+            config_file.write_text(json.dumps({
+                "code_maat": {"jar_path": str(jar_file), **(code_maat or {})},
+                "server": server or {}
+            }))
+            return CodeMaatWrapper(config_path=str(config_file))
+        
+        return make
     
     @pytest.fixture
-    def mock_jar_file(self):
-        """Create mock JAR file."""
-        with tempfile.NamedTemporaryFile(suffix='.jar', delete=False) as f:
-            temp_path = f.name
+    def log_file(self, tmp_path):
+        """Create a log file to analyze."""
+        path = tmp_path / "logfile.log"
+        path.write_text("--hash--2024-01-01--author\n")
+        return str(path)
+    
+    def test_jar_checked_once_per_process(self, make_wrapper):
+        """Test the JAR path is resolved and checked only for the first wrapper."""
+        with patch('os.access', wraps=os.access) as access:
+            first = make_wrapper()
+            second = make_wrapper()
         
-        yield temp_path
-        os.unlink(temp_path)
+        assert access.call_count == 1
+        assert first.config.jar_path == second.config.jar_path
+    
+    def test_missing_jar_not_remembered(self, tmp_path):
+        """Test a missing JAR is reported again rather than cached."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"code_maat": {"jar_path": str(tmp_path / "missing.jar")}}))
+        
+        for _ in range(2):
+            with pytest.raises(CodeMaatError, match="JAR not found"):
+                CodeMaatWrapper(config_path=str(config_file))
+        
+        (tmp_path / "missing.jar").touch()
+        assert CodeMaatWrapper(config_path=str(config_file)).config.jar_path == str(tmp_path / "missing.jar")
     
     def test_load_config_from_file(self, temp_config_file):
         """Test loading config from file."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper(config_path=temp_config_file)
-            
-            assert wrapper.config.jar_path == "/test/path/code-maat.jar"
-            assert wrapper.config.java_executable == "test-java"
-            assert wrapper.config.java_opts == ["-Xmx2g"]
+        wrapper = CodeMaatWrapper(config_path=temp_config_file, path_exists=_ANY_PATH)
+        
+        assert wrapper.config.jar_path == "/test/path/code-maat.jar"
+        assert wrapper.config.java_executable == "test-java"
+        assert wrapper.config.java_opts == ("-Xmx2g",)
     
     def test_load_config_defaults(self):
         """Test loading default config when file not found."""
-        with patch('os.path.exists', return_value=False):
-            wrapper = CodeMaatWrapper(config_path="/nonexistent/config.json")
+        wrapper = CodeMaatWrapper(config_path="/nonexistent/config.json", path_exists=_ANY_PATH)
+        
+        # The default relative JAR path is resolved against the mcp-server directory
+        assert wrapper.config.jar_path.endswith(
+            os.path.join("target", "code-maat-1.0.5-SNAPSHOT-standalone.jar")
+        )
+        assert wrapper.config.java_executable == "java"
+    
+    def test_config_file_parsed_once(self, mock_jar_file, tmp_path):
+        """Test an unchanged config file is parsed once and an edited one again."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"code_maat": {"jar_path": mock_jar_file}}))
+        
+        with patch('src.code_maat_wrapper._json_loads', wraps=_json_loads) as loads:
+            first = CodeMaatWrapper(config_path=str(config_file))
+            second = CodeMaatWrapper(config_path=str(config_file))
+            assert loads.call_count == 1
             
-            assert "../target/code-maat-1.0.5-SNAPSHOT-standalone.jar" in wrapper.config.jar_path
-            assert wrapper.config.java_executable == "java"
+            config_file.write_text(json.dumps({
+                "code_maat": {"jar_path": mock_jar_file, "java_executable": "other-java"}
+            }))
+            third = CodeMaatWrapper(config_path=str(config_file))
+        
+        assert first.config == second.config
+        assert third.config.java_executable == "other-java"
+        assert loads.call_count == 2
     
-    def test_validate_inputs_success(self, mock_jar_file):
+    def test_validate_inputs_success(self, wrapper_factory, log_file):
         """Test successful input validation."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            # Should not raise exception
-            result = wrapper.validate_inputs("logfile.log", "git2", "coupling")
-            assert result is True
+        wrapper = wrapper_factory()
+        
+        # Should not raise exception
+        result = wrapper.validate_inputs(log_file, "git2", "coupling")
+        assert result is True
     
-    def test_validate_inputs_missing_log_file(self, mock_jar_file):
+    def test_validate_inputs_missing_log_file(self, wrapper_factory):
         """Test validation with missing log file."""
-        with patch('os.path.exists', side_effect=lambda path: path == mock_jar_file):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with pytest.raises(CodeMaatError, match="Log file not found"):
-                wrapper.validate_inputs("/nonexistent/logfile.log", "git2", "coupling")
+        wrapper = wrapper_factory()
+        
+        with pytest.raises(CodeMaatError, match="Log file not found"):
+            wrapper.validate_inputs("/nonexistent/logfile.log", "git2", "coupling")
     
-    def test_validate_inputs_invalid_vcs(self, mock_jar_file):
+    def test_validate_inputs_invalid_vcs(self, wrapper_factory, log_file):
         """Test validation with invalid VCS."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with pytest.raises(CodeMaatError, match="Unsupported VCS"):
-                wrapper.validate_inputs("logfile.log", "invalid_vcs", "coupling")
+        wrapper = wrapper_factory()
+        
+        with pytest.raises(CodeMaatError, match=re.escape("Unsupported VCS: invalid_vcs. Supported: git, git2, hg")):
+            wrapper.validate_inputs(log_file, "invalid_vcs", "coupling")
     
-    def test_validate_inputs_invalid_analysis(self, mock_jar_file):
+    def test_validate_inputs_invalid_analysis(self, wrapper_factory, log_file):
         """Test validation with invalid analysis."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with pytest.raises(CodeMaatError, match="Unsupported analysis"):
-                wrapper.validate_inputs("logfile.log", "git2", "invalid_analysis")
+        wrapper = wrapper_factory()
+        
+        with pytest.raises(CodeMaatError, match=_UNSUPPORTED_ANALYSIS_RE):
+            wrapper.validate_inputs(log_file, "git2", "invalid_analysis")
     
-    @patch('subprocess.run')
-    def test_run_analysis_success(self, mock_run, mock_jar_file):
+    @patch('subprocess.Popen')
+    def test_run_analysis_success(self, mock_popen, log_file):
         """Test successful analysis execution."""
         # Mock successful subprocess execution
-        mock_result = MagicMock()
-        mock_result.stdout = "entity,coupled,degree\nfile1.java,file2.java,78\n"
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            results = wrapper.run_analysis("logfile.log", "git2", "coupling")
-            
-            assert len(results) == 1
-            assert results[0]["entity"] == "file1.java"
-            assert results[0]["coupled"] == "file2.java"
-            assert results[0]["degree"] == 78
+        mock_popen.return_value = fake_popen("entity,coupled,degree\nfile1.java,file2.java,78\n")
+        wrapper = CodeMaatWrapper(path_exists=_ANY_PATH)
+        
+        results = wrapper.run_analysis(log_file, "git2", "coupling")
+        
+        assert len(results) == 1
+        assert results[0]["entity"] == "file1.java"
+        assert results[0]["coupled"] == "file2.java"
+        assert results[0]["degree"] == 78
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_persistent_jvm(self, mock_popen, make_wrapper, log_file):
+        """Test analysis execution through the persistent JVM bridge."""
+        bridge = MagicMock()
+        bridge.run.return_value = "entity,coupled,degree\nfile1.java,file2.java,78\n"
+        
+        with patch('src.code_maat_wrapper.jpype'), \
+             patch('src.code_maat_wrapper.JvmBridge.instance', return_value=bridge):
+            wrapper = make_wrapper(code_maat={"persistent_jvm": True})
+            results = wrapper.run_analysis(log_file, "git2", "coupling", min_revs=3)
+        
+        bridge.run.assert_called_once_with(
+            ["-l", log_file, "-c", "git2", "-a", "coupling", "-n", "3"]
+        )
+        mock_popen.assert_not_called()
+        assert results[0]["degree"] == 78
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_cached(self, mock_popen, make_wrapper, log_file):
+        """Test repeated analyses of an unchanged log reuse the cached results."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("entity,n-revs\nfile1.java,4\n")
+        wrapper = make_wrapper()
+        
+        first = wrapper.run_analysis(log_file, "git2", "revisions", min_revs=3)
+        second = wrapper.run_analysis(log_file, "git2", "revisions", min_revs=3)
+        assert first == second == [{"entity": "file1.java", "n-revs": 4}]
+        assert mock_popen.call_count == 1
+        
+        # Different options and a modified log file both miss the cache
+        wrapper.run_analysis(log_file, "git2", "revisions", min_revs=4)
+        with open(log_file, "a") as f:
+            f.write("file1.java\t1\t1\n")
+        wrapper.run_analysis(log_file, "git2", "revisions", min_revs=3)
+        assert mock_popen.call_count == 3
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_use_cache_false(self, mock_popen, make_wrapper, log_file, tmp_path):
+        """Test use_cache=False re-runs Code Maat and refreshes both caches."""
+        mock_popen.side_effect = [
+            fake_popen("entity,n-revs\nfile1.java,3\n"),
+            fake_popen("entity,n-revs\nfile1.java,4\n")
+        ]
+        wrapper = make_wrapper(server={"disk_cache_dir": str(tmp_path / "cache")})
+        
+        wrapper.run_analysis(log_file, "git2", "revisions")
+        fresh = wrapper.run_analysis(log_file, "git2", "revisions", use_cache=False)
+        
+        assert fresh == [{"entity": "file1.java", "n-revs": 4}]
+        assert wrapper.run_analysis(log_file, "git2", "revisions") == fresh
+        assert make_wrapper(server={"disk_cache_dir": str(tmp_path / "cache")}).run_analysis(
+            log_file, "git2", "revisions"
+        ) == fresh
+        assert mock_popen.call_count == 2
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_cache_disabled(self, mock_popen, make_wrapper, log_file):
+        """Test caching can be turned off in the server config."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("entity,n-revs\nfile1.java,4\n")
+        wrapper = make_wrapper(server={"cache_results": False})
+        
+        wrapper.run_analysis(log_file, "git2", "revisions")
+        wrapper.run_analysis(log_file, "git2", "revisions")
+        assert mock_popen.call_count == 2
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_identity_not_cached(self, mock_popen, make_wrapper, log_file, tmp_path):
+        """Test identity results are kept out of the memory and disk caches."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("entity,n-revs\nfile1.java,4\n")
+        disk_cache = tmp_path / "cache"
+        wrapper = make_wrapper(server={"disk_cache_dir": str(disk_cache)})
+        
+        wrapper.run_analysis(log_file, "git2", "identity")
+        wrapper.run_analysis(log_file, "git2", "identity")
+        assert mock_popen.call_count == 2
+        assert not wrapper._cache
+        assert not disk_cache.exists() or not any(disk_cache.iterdir())
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_json_output(self, mock_popen, make_wrapper, log_file):
+        """Test JSON output is requested from Code Maat and parsed without conversion."""
+        mock_popen.return_value = fake_popen('[{"entity":"file1.java","coupled":"file2.java","degree":78}]\n')
+        wrapper = make_wrapper(code_maat={"output_format": "json"})
+        
+        results = wrapper.run_analysis(log_file, "git2", "coupling")
+        
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[-2:] == ["-f", "json"]
+        assert results == [{"entity": "file1.java", "coupled": "file2.java", "degree": 78}]
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_disk_cache(self, mock_popen, make_wrapper, log_file, tmp_path):
+        """Test results persist on disk across wrappers until the log changes."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("entity,n-revs\nfile1.java,3\n")
+        server = {"disk_cache_dir": str(tmp_path / "cache")}
+        
+        first = make_wrapper(server=server).run_analysis(log_file, "git2", "revisions")
+        second = make_wrapper(server=server).run_analysis(log_file, "git2", "revisions")
+        
+        assert first == second == [{"entity": "file1.java", "n-revs": 3}]
+        assert mock_popen.call_count == 1
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+        
+        with open(log_file, "a") as f:
+            f.write("--hash2--2024-01-02--author\n")
+        make_wrapper(server=server).run_analysis(log_file, "git2", "revisions")
+        assert mock_popen.call_count == 2
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_corrupt_disk_cache(self, mock_popen, make_wrapper, log_file, tmp_path):
+        """Test an unreadable disk cache entry is recomputed and replaced."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("entity,n-revs\nfile1.java,3\n")
+        wrapper = make_wrapper(server={"disk_cache_dir": str(tmp_path / "cache")})
+        
+        wrapper.run_analysis(log_file, "git2", "revisions")
+        entry, = (tmp_path / "cache").iterdir()
+        entry.write_bytes(b"not compressed")
+        
+        results = make_wrapper(server={"disk_cache_dir": str(tmp_path / "cache")}).run_analysis(
+            log_file, "git2", "revisions"
+        )
+        
+        assert results == [{"entity": "file1.java", "n-revs": 3}]
+        assert mock_popen.call_count == 2
+        assert entry.read_bytes() != b"not compressed"
+    
+    def test_wrapper_uses_worker_without_jpype(self, make_wrapper, log_file):
+        """Test persistent_jvm falls back to the worker when JPype is missing."""
+        with patch('src.code_maat_wrapper.jpype', None), \
+             patch.object(CodeMaatWorker, 'run', return_value="entity,n-revs\nfile1.java,3\n") as run:
+            wrapper = make_wrapper(code_maat={"persistent_jvm": True})
+            results = wrapper.run_analysis(log_file, "git2", "revisions")
+        
+        assert results == [{"entity": "file1.java", "n-revs": 3}]
+        run.assert_called_once_with(["-l", log_file, "-c", "git2", "-a", "revisions"])
+        assert wrapper._new_worker()._cmd[-1] == "--serve"
+    
+    def test_persistent_jvm_opts(self, make_wrapper):
+        """Test long-lived JVMs drop the short-run flags and get the full heap."""
+        wrapper = make_wrapper(code_maat={"persistent_jvm": True})
+        cmd = wrapper._new_worker()._cmd
+        
+        assert "-XX:TieredStopAtLevel=1" not in cmd
+        assert "-XX:+UseSerialGC" not in cmd
+        assert "-Djava.awt.headless=true" in cmd
+        assert f"-Xmx{MAX_HEAP_MB}m" in cmd
+        assert _persistent_java_opts(DEFAULT_JAVA_OPTS) == cmd[1:cmd.index("-jar")]
+        assert _persistent_java_opts(("-Xmx1g",)) == ["-Xmx1g"]
+    
+    def test_worker_pool_grows_to_worker_processes(self, make_wrapper):
+        """Test concurrent checkouts get separate workers up to the pool size."""
+        wrapper = make_wrapper(code_maat={"persistent_jvm": True, "worker_processes": 2})
+        
+        with wrapper._checkout_worker() as first, wrapper._checkout_worker() as second:
+            assert first is not second
+        with wrapper._checkout_worker() as third:
+            assert third in (first, second)
+        assert wrapper._worker_count == 2
     
     @patch('subprocess.run')
-    def test_run_analysis_failure(self, mock_run, mock_jar_file):
+    def test_warm_up_runs_help(self, mock_run, make_wrapper):
+        """Test warmup starts a throwaway Code Maat help run."""
+        wrapper = make_wrapper()
+        
+        wrapper.warm_up()
+        
+        cmd = mock_run.call_args[0][0]
+        assert cmd[-3:] == ["-jar", wrapper.config.jar_path, "-h"]
+    
+    def test_warm_up_persistent_jvm(self, make_wrapper):
+        """Test warmup boots the JVM bridge when a persistent JVM is used."""
+        with patch('src.code_maat_wrapper.jpype'), \
+             patch('src.code_maat_wrapper.JvmBridge.instance') as instance:
+            wrapper = make_wrapper(code_maat={"persistent_jvm": True})
+            wrapper.warm_up()
+        
+        instance.assert_called_once_with(wrapper.config)
+    
+    @patch('subprocess.run', side_effect=OSError("java not found"))
+    def test_warm_up_failure_is_ignored(self, mock_run, make_wrapper):
+        """Test a failing warmup does not raise."""
+        make_wrapper().warm_up()
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_bundle(self, mock_popen, make_wrapper, log_file):
+        """Test a bundle runs all analyses in one Code Maat call."""
+        mock_popen.return_value = fake_popen(json.dumps({
+            "summary": [{"statistic": "number-of-commits", "value": 1}],
+            "coupling": []
+        }))
+        wrapper = make_wrapper()
+        
+        results = wrapper.run_analysis_bundle(log_file, "git2", ["summary", "coupling"], min_revs=3)
+        
+        assert results == {
+            "summary": [{"statistic": "number-of-commits", "value": 1}],
+            "coupling": []
+        }
+        mock_popen.assert_called_once()
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-A") + 1] == "summary,coupling"
+        assert cmd[cmd.index("-n") + 1] == "3"
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_bundle_uses_cache(self, mock_popen, make_wrapper, log_file):
+        """Test cached analyses are left out of the bundle and bundle results are cached."""
+        mock_popen.side_effect = [
+            fake_popen("entity,n-revs\nfile1.java,3\n"),
+            fake_popen(json.dumps({"summary": [{"statistic": "number-of-commits", "value": 1}]}))
+        ]
+        wrapper = make_wrapper()
+        
+        revisions = wrapper.run_analysis(log_file, "git2", "revisions")
+        results = wrapper.run_analysis_bundle(log_file, "git2", ["revisions", "summary"])
+        
+        assert results["revisions"] == revisions
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-A") + 1] == "summary"
+        
+        assert wrapper.run_analysis(log_file, "git2", "summary") == results["summary"]
+        assert mock_popen.call_count == 2
+    
+    def test_run_analysis_bundle_rejects_unknown_analysis(self, make_wrapper, log_file):
+        """Test every analysis in a bundle is validated up front."""
+        wrapper = make_wrapper()
+        
+        with pytest.raises(CodeMaatError, match=_UNSUPPORTED_ANALYSIS_RE):
+            wrapper.run_analysis_bundle(log_file, "git2", ["summary", "bogus"])
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_nonzero_exit(self, mock_popen, make_wrapper, log_file):
+        """Test a failing Code Maat run is reported even though stdout is not CSV."""
+        mock_popen.return_value = fake_popen("Error:  Invalid analysis\n\nUsage: ...\n", returncode=1)
+        wrapper = make_wrapper()
+        
+        with pytest.raises(CodeMaatError, match="Code Maat execution failed"):
+            wrapper.run_analysis(log_file, "git2", "coupling")
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_log_stream(self, mock_popen, make_wrapper):
+        """Test a streamed log becomes Code Maat's stdin and is not cached."""
+        mock_popen.side_effect = lambda *args, **kwargs: fake_popen("statistic,value\nnumber-of-commits,2\n")
+        wrapper = make_wrapper()
+        stream = io.BytesIO(b"--hash--2024-01-01--Author\n1\t0\tfile1.java\n")
+        
+        results = wrapper.run_analysis(None, "git2", "summary", log_stream=stream)
+        wrapper.run_analysis(None, "git2", "summary", log_stream=stream)
+        
+        assert results == [{"statistic": "number-of-commits", "value": 2}]
+        assert mock_popen.call_count == 2
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index("-l") + 1] == "/dev/stdin"
+        assert mock_popen.call_args[1]["stdin"] is stream
+    
+    @patch('subprocess.Popen')
+    def test_analyze_repository_pipes_git_log(self, mock_popen, make_wrapper, tmp_path):
+        """Test git log output is piped into Code Maat without a log file."""
+        git = MagicMock()
+        git.__enter__.return_value = git
+        git.stderr = io.BytesIO(b"")
+        git.wait.return_value = 0
+        mock_popen.side_effect = [git, fake_popen("statistic,value\nnumber-of-commits,2\n")]
+        wrapper = make_wrapper()
+        
+        results = wrapper.analyze_repository(str(tmp_path), "summary", min_revs=3)
+        
+        assert results == [{"statistic": "number-of-commits", "value": 2}]
+        git_call, code_maat_call = mock_popen.call_args_list
+        assert git_call[0][0][:2] == ["git", "log"]
+        assert git_call[1]["cwd"] == str(tmp_path)
+        assert code_maat_call[1]["stdin"] is git.stdout
+        assert "-n" in code_maat_call[0][0]
+        git.stdout.close.assert_called_once()
+    
+    @patch('subprocess.Popen')
+    def test_analyze_repository_git_error(self, mock_popen, make_wrapper, tmp_path):
+        """Test a failing git log is reported instead of Code Maat's error."""
+        git = MagicMock()
+        git.__enter__.return_value = git
+        git.stderr = io.BytesIO(b"fatal: not a git repository")
+        git.wait.return_value = 128
+        mock_popen.side_effect = [git, fake_popen("Error: empty log\n", returncode=1)]
+        wrapper = make_wrapper()
+        
+        with pytest.raises(CodeMaatError, match=_NOT_A_REPO_RE):
+            wrapper.analyze_repository(str(tmp_path), "summary")
+    
+    @pytest.mark.parametrize("log_mb,heap", [(0, "-Xmx256m"), (100, "-Xmx800m"), (1024, "-Xmx4096m")])
+    def test_heap_sized_from_log_file(self, make_wrapper, log_file, log_mb, heap):
+        """Test the JVM heap follows the log size within its bounds."""
+        wrapper = make_wrapper(code_maat={"java_opts": DEFAULT_JAVA_OPTS})
+        
+        with patch('os.path.getsize', return_value=log_mb * 1024 * 1024):
+            assert wrapper._heap_opts(log_file) == [heap]
+    
+    @patch('subprocess.Popen')
+    def test_explicit_heap_not_overridden(self, mock_popen, make_wrapper, log_file):
+        """Test a configured -Xmx is passed through unchanged."""
+        mock_popen.return_value = fake_popen("entity,n-revs\nfile1.java,3\n")
+        wrapper = make_wrapper(code_maat={"java_opts": ["-Xmx2g"]})
+        
+        wrapper.run_analysis(log_file, "git2", "revisions")
+        
+        cmd = mock_popen.call_args[0][0]
+        assert [opt for opt in cmd if opt.startswith("-Xmx")] == ["-Xmx2g"]
+    
+    @pytest.mark.parametrize("use_pandas", [True, False])
+    def test_parse_csv_output_quoted_cells(self, make_wrapper, use_pandas):
+        """Test quoted cells after plain lines are still tokenized correctly."""
+        pd = pytest.importorskip("pandas") if use_pandas else None
+        wrapper = make_wrapper()
+        csv_output = 'entity,n-revs\nfile1.java,3\n"dir,with,commas/a.java",2\n"multi\nline.java",1\nfile2.java,4\n'
+        
+        with patch('src.code_maat_wrapper.pd', pd):
+            results = wrapper._parse_csv_output(csv_output)
+        
+        assert results == [
+            {"entity": "file1.java", "n-revs": 3},
+            {"entity": "dir,with,commas/a.java", "n-revs": 2},
+            {"entity": "multi\nline.java", "n-revs": 1},
+            {"entity": "file2.java", "n-revs": 4}
+        ]
+    
+    @pytest.mark.parametrize("use_pandas", [True, False])
+    def test_parse_stream_decodes_utf8(self, make_wrapper, use_pandas):
+        """Test binary Code Maat output is decoded as UTF-8 and left readable."""
+        pd = pytest.importorskip("pandas") if use_pandas else None
+        wrapper = make_wrapper()
+        stream = io.BytesIO("author,n-revs\nJosé,3\n".encode("utf-8"))
+        
+        with patch('src.code_maat_wrapper.pd', pd):
+            results = wrapper._parse_stream(stream, "csv")
+        
+        assert results == [{"author": "José", "n-revs": 3}]
+        assert not stream.closed
+    
+    @pytest.mark.parametrize("use_pandas", [True, False])
+    def test_parse_csv_output(self, make_wrapper, use_pandas):
+        """Test CSV parsing with and without pandas gives the same rows."""
+        pd = pytest.importorskip("pandas") if use_pandas else None
+        wrapper = make_wrapper()
+        csv_output = "entity,coupled,degree,average-revs\nfile1.java,,78,1.5\nNA,file3.java,12,3.25\n"
+        
+        with patch('src.code_maat_wrapper.pd', pd):
+            results = wrapper._parse_csv_output(csv_output)
+        
+        assert results == [
+            {"entity": "file1.java", "coupled": None, "degree": 78, "average-revs": 1.5},
+            {"entity": "NA", "coupled": "file3.java", "degree": 12, "average-revs": 3.25},
+        ]
+    
+    @pytest.mark.parametrize("csv_output,expected", [
+        pytest.param(
+            "entity,degree\na.java,78\nb.java,\n",
+            [{"entity": "a.java", "degree": 78}, {"entity": "b.java", "degree": None}],
+            id="int-column-with-blank"
+        ),
+        pytest.param(
+            "entity,value\n a.java ,2\nb.java,1.5\nc.java,text\n",
+            [
+                {"entity": "a.java", "value": 2},
+                {"entity": "b.java", "value": 1.5},
+                {"entity": "c.java", "value": "text"}
+            ],
+            id="mixed-column"
+        ),
+        pytest.param(
+            "entity,coupled,degree\na,b,1\nc,d\n",
+            [{"entity": "a", "coupled": "b", "degree": 1}, {"entity": "c", "coupled": "d", "degree": None}],
+            id="short-row"
+        ),
+        pytest.param(
+            "entity,n\na,1,x\nc,2\n",
+            [{"entity": "a", "n": 1}, {"entity": "c", "n": 2}],
+            id="long-row"
+        ),
+        pytest.param(
+            "entity,n\na,1\n\nc,2\n",
+            [{"entity": "a", "n": 1}, {"entity": "c", "n": 2}],
+            id="blank-line"
+        ),
+        pytest.param(
+            'entity,n\n"a,b",1\n\nc,2\n',
+            [{"entity": "a,b", "n": 1}, {"entity": "c", "n": 2}],
+            id="blank-line-after-quote"
+        ),
+    ])
+    # pandas warns about the cells it drops from the long row
+    @pytest.mark.filterwarnings("ignore:Length of header or names")
+    def test_parse_csv_pandas_matches_fallback(self, make_wrapper, csv_output, expected):
+        """Test pandas converts cells exactly like the csv module fallback."""
+        pd = pytest.importorskip("pandas")
+        wrapper = make_wrapper()
+        
+        with patch('src.code_maat_wrapper.pd', None):
+            fallback = wrapper._parse_csv_output(csv_output)
+        with patch('src.code_maat_wrapper.pd', pd):
+            with_pandas = wrapper._parse_csv_output(csv_output)
+        
+        assert fallback == expected
+        assert with_pandas == fallback
+        # 78 == 78.0, so compare the cell types too
+        assert [{k: type(v) for k, v in row.items()} for row in with_pandas] == \
+            [{k: type(v) for k, v in row.items()} for row in fallback]
+    
+    @patch('subprocess.Popen')
+    def test_run_analysis_failure(self, mock_popen, log_file):
         """Test analysis execution failure."""
-        # Mock failed subprocess execution
-        mock_run.side_effect = Exception("Command failed")
+        # Mock a java executable that cannot be started
+        mock_popen.side_effect = FileNotFoundError("No such file or directory: 'java'")
+        wrapper = CodeMaatWrapper(path_exists=_ANY_PATH)
         
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with pytest.raises(CodeMaatError):
-                wrapper.run_analysis("logfile.log", "git2", "coupling")
-    
-    def test_convert_value_integer(self, mock_jar_file):
-        """Test value conversion to integer."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            assert wrapper._convert_value("123") == 123
-            assert wrapper._convert_value("0") == 0
-    
-    def test_convert_value_float(self, mock_jar_file):
-        """Test value conversion to float."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            assert wrapper._convert_value("123.45") == 123.45
-            assert wrapper._convert_value("0.0") == 0.0
-    
-    def test_convert_value_string(self, mock_jar_file):
-        """Test value conversion to string."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            assert wrapper._convert_value("text") == "text"
-            assert wrapper._convert_value("  spaced  ") == "spaced"
-    
-    def test_convert_value_empty(self, mock_jar_file):
-        """Test value conversion of empty strings."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            assert wrapper._convert_value("") is None
-            assert wrapper._convert_value("   ") is None
+        with pytest.raises(CodeMaatError, match="Cannot run Code Maat"):
+            wrapper.run_analysis(log_file, "git2", "coupling")
     
-    def test_get_analysis_info_known(self, mock_jar_file):
+    @pytest.mark.parametrize("raw,expected", [
+        ("123", 123), ("0", 0), ("123.45", 123.45), ("0.0", 0.0),
+        ("text", "text"), ("  spaced  ", "spaced"), ("", None), ("   ", None),
+    ])
+    def test_convert_value(self, wrapper_factory, raw, expected):
+        """Test value conversion to numbers, stripped text and None."""
+        assert wrapper_factory()._convert_value(raw) == expected
+    
+    @pytest.mark.parametrize("raw,expected", [
+        ("+5", 5), ("1e5", 1e5), ("-1.5E-3", -1.5e-3), (".5", 0.5), ("5.", 5.0),
+        ("+1.5", 1.5), ("-.5", -0.5),
+    ])
+    def test_convert_value_number_forms(self, wrapper_factory, raw, expected):
+        """Test every form that int() or float() accepts converts, to the same type."""
+        value = wrapper_factory()._convert_value(raw)
+        
+        assert value == expected
+        assert type(value) is type(expected)
+    
+    @pytest.mark.parametrize("raw", [".", "+", "e5", "1e", "1.2.3", "--1"])
+    def test_convert_value_not_numbers(self, wrapper_factory, raw):
+        """Test text that only resembles a number is kept as text."""
+        assert wrapper_factory()._convert_value(raw) == raw
+    
+    def test_convert_value_non_numeric_words(self, make_wrapper):
+        """Test words that float() would accept are kept as text."""
+        wrapper = make_wrapper()
+        
+        assert wrapper._convert_value("nan") == "nan"
+        assert wrapper._convert_value("Infinity") == "Infinity"
+        assert wrapper._convert_value("-12") == -12
+        assert wrapper._convert_value("1.5e3") == 1500.0
+    
+    def test_get_analysis_info_known(self, wrapper_factory):
         """Test getting info for known analysis."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            info = wrapper.get_analysis_info("coupling")
-            
-            assert "description" in info
-            assert "output_columns" in info
-            assert "use_case" in info
+        wrapper = wrapper_factory()
+        
+        info = wrapper.get_analysis_info("coupling")
+        
+        assert "description" in info
+        assert "output_columns" in info
+        assert "use_case" in info
     
-    def test_get_analysis_info_unknown(self, mock_jar_file):
+    def test_get_analysis_info_unknown(self, wrapper_factory):
         """Test getting info for unknown analysis."""
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            info = wrapper.get_analysis_info("unknown_analysis")
-            
-            assert "description" in info
-            assert "unknown_analysis" in info["description"]
+        wrapper = wrapper_factory()
+        
+        info = wrapper.get_analysis_info("unknown_analysis")
+        
+        assert "description" in info
+        assert "unknown_analysis" in info["description"]
+    
+    def test_get_analysis_info_shared_read_only(self, make_wrapper):
+        """Test known analyses return the same read-only description."""
+        wrapper = make_wrapper()
+        info = wrapper.get_analysis_info("coupling")
+        
+        assert wrapper.get_analysis_info("coupling") is info
+        with pytest.raises(TypeError):
+            info["description"] = "changed"
     
     @patch('subprocess.run')
-    def test_generate_git_log_success(self, mock_run, mock_jar_file):
+    def test_generate_git_log_success(self, mock_run, make_wrapper, tmp_path):
         """Test successful git log generation."""
-        mock_result = MagicMock()
-        mock_result.stdout = "--hash--date--author\nfile1.java\t10\t5\n"
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                output_file = temp_file.name
-            
-            try:
-                result = wrapper.generate_git_log("/test/repo", output_file)
-                
-                assert result == output_file
-                assert os.path.exists(output_file)
-                
-                with open(output_file, 'r') as f:
-                    content = f.read()
-                    assert "--hash--date--author" in content
-                    
-            finally:
-                if os.path.exists(output_file):
-                    os.unlink(output_file)
+        def run(cmd, stdout, **kwargs):
+            stdout.write(b"--hash--date--author\nfile1.java\t10\t5\n")
+            return SimpleNamespace(returncode=0)
+        
+        mock_run.side_effect = run
+        wrapper = make_wrapper()
+        output_file = str(tmp_path / "out.log")
+        
+        result = wrapper.generate_git_log(str(tmp_path), output_file)
+        
+        assert result == output_file
+        assert "--hash--date--author" in (tmp_path / "out.log").read_text()
     
     @patch('subprocess.run')
-    def test_generate_git_log_failure(self, mock_run, mock_jar_file):
+    def test_generate_git_log_git_error(self, mock_run, make_wrapper, tmp_path):
+        """Test git's stderr is surfaced when git log fails."""
+        mock_run.side_effect = subprocess.CalledProcessError(
+            128, ["git", "log"], stderr=b"fatal: not a git repository"
+        )
+        wrapper = make_wrapper()
+        
+        with pytest.raises(CodeMaatError, match=_NOT_A_REPO_RE):
+            wrapper.generate_git_log(str(tmp_path), str(tmp_path / "output.log"))
+    
+    @patch('subprocess.run')
+    def test_generate_git_log_failure(self, mock_run, tmp_path):
         """Test git log generation failure."""
-        mock_run.side_effect = Exception("Git command failed")
+        mock_run.side_effect = FileNotFoundError("No such file or directory: 'git'")
+        wrapper = CodeMaatWrapper(path_exists=_ANY_PATH)
         
-        with patch('os.path.exists', return_value=True):
-            wrapper = CodeMaatWrapper()
-            wrapper.config.jar_path = mock_jar_file
-            
-            with pytest.raises(CodeMaatError):
-                wrapper.generate_git_log("/test/repo", "/tmp/output.log")
\ No newline at end of file
+        with pytest.raises(CodeMaatError, match="Git log generation failed"):
+            wrapper.generate_git_log(str(tmp_path), str(tmp_path / "output.log"))
+
+    
+    @patch('subprocess.Popen')
+    def test_generate_git_log_stream_git_missing(self, mock_popen, make_wrapper, tmp_path):
+        """Test a git that cannot be started is reported when streaming the log."""
+        mock_popen.side_effect = FileNotFoundError("No such file or directory: 'git'")
+        wrapper = make_wrapper()
+        
+        with pytest.raises(CodeMaatError, match="Cannot run git"):
+            wrapper.generate_git_log(str(tmp_path), stream=True)
+
+class TestCodeMaatWorker:
+    """Test CodeMaatWorker against a stand-in for Code Maat's --serve loop."""
+    
+    @pytest.fixture
+    def worker(self):
+        """Create a worker running the fake serve loop."""
+        worker = CodeMaatWorker([sys.executable, "-c", FAKE_WORKER], timeout=5)
+        yield worker
+        worker.close()
+    
+    def test_reuses_process(self, worker):
+        """Test consecutive requests are answered by the same process."""
+        first = worker.run(["-a", "coupling"])
+        second = worker.run(["-a", "summary"])
+        
+        assert first.endswith(",-a coupling\n")
+        assert first.split("\n")[1].split(",")[0] == second.split("\n")[1].split(",")[0]
+    
+    def test_error_response(self, worker):
+        """Test a failed run is raised as CodeMaatError."""
+        with pytest.raises(CodeMaatError, match="Invalid analysis requested"):
+            worker.run(["fail"])
+    
+    def test_restarts_dead_worker(self, worker):
+        """Test a worker that exited is restarted for the next request."""
+        first = worker.run(["exit-after"])
+        second = worker.run(["-a", "summary"])
+        
+        assert first.split("\n")[1].split(",")[0] != second.split("\n")[1].split(",")[0]
+    
+    def test_crashing_request(self, worker):
+        """Test a request that keeps killing the worker fails instead of looping."""
+        with pytest.raises(CodeMaatError, match="exited unexpectedly"):
+            worker.run(["crash"])
+        
+        assert worker.run(["-a", "summary"]).endswith(",-a summary\n")
+    
+    def test_invalid_response(self, worker):
+        """Test output that is not a response, e.g. from a JAR without --serve."""
+        with pytest.raises(CodeMaatError, match="does the JAR support --serve"):
+            worker.run(["garbage"])
+    
+    def test_timeout(self):
+        """Test a hanging request is killed after the timeout."""
+        worker = CodeMaatWorker([sys.executable, "-c", FAKE_WORKER], timeout=0.5)
+        try:
+            with pytest.raises(CodeMaatError, match="timed out"):
+                worker.run(["hang"])
+            assert worker.run(["-a", "summary"]).endswith(",-a summary\n")
+        finally:
+            worker.close()
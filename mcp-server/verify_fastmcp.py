@@ -1,42 +0,0 @@
-#!/usr/bin/env python3
-"""
-Verify that the FastMCP-based Code Maat server works correctly.
-"""
-
-import sys
-import os
-
-# Add paths
-sys.path.insert(0, '.')
-os.chdir('/Users/tobias.baumbach/git/code-maat/mcp-server')
-
-try:
-    print("🧪 Testing FastMCP-based Code Maat Server...")
-    
-    # Test imports
-    from src.mcp_server import mcp, analysis_tools, utility_tools
-    print("✅ FastMCP server imported successfully")
-    
-    # Test tools initialization
-    print(f"✅ Analysis tools ready")
-    print(f"✅ Utility tools ready")
-    
-    # Test JAR access
-    jar_path = analysis_tools.wrapper.config.jar_path
-    if os.path.exists(jar_path):
-        print(f"✅ Code Maat JAR found: {jar_path}")
-    else:
-        print(f"❌ Code Maat JAR not found: {jar_path}")
-    
-    # Test FastMCP server structure
-    print("✅ FastMCP server tools and resources configured")
-    print("✅ All MCP decorators applied successfully")
-    
-    print("\n🎉 FastMCP server verification successful!")
-    print("✅ Ready for Claude Desktop integration")
-    
-except Exception as e:
-    print(f"❌ Verification failed: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
\ No newline at end of file
@@ -12,6 +12,7 @@
 		 [incanter/incanter-core "1.5.7"]
                  [org.clojure/tools.cli "0.3.1"]
                  [org.clojure/data.csv "0.1.2"]
+                 [org.clojure/data.json "0.2.6"]
                  [clj-time "0.9.0"]
                  [org.clojure/math.numeric-tower "0.0.4"]
                  [org.clojure/math.combinatorics "0.1.1"]
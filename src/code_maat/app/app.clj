@@ -13,7 +13,9 @@
             [code-maat.parsers.xml :as xml]
             [incanter.core :as incanter]
             [clojure.string :as string]
+            [clojure.java.io :as io]
             [code-maat.output.csv :as csv-output]
+            [code-maat.output.json :as json-output]
             [code-maat.analysis.authors :as authors]
             [code-maat.analysis.entities :as entities]
             [code-maat.analysis.logical-coupling :as coupling]
@@ -190,14 +192,24 @@
     (team-mapper/run commits (team-mapper/file->author-team-lookup team-map-file))
     commits))
 
+(defn- output-writers
+  "Returns the [write-to write-to-file] pair of the
+   requested output module. CSV is the default."
+  [options]
+  (case (:output-format options)
+    "json" [json-output/write-to json-output/write-to-file]
+    [csv-output/write-to csv-output/write-to-file]))
+
 (defn- make-stdout-output [options]
-  (if-let [n-out-rows (:rows options)]
-    #(csv-output/write-to :stream % n-out-rows)
-    #(csv-output/write-to :stream %)))
+  (let [[write-to _] (output-writers options)]
+    (if-let [n-out-rows (:rows options)]
+      #(write-to :stream % n-out-rows)
+      #(write-to :stream %))))
 
 (defn- make-output [options]
   (if-let [output-file (:outfile options)]
-    #(csv-output/write-to-file output-file :stream %)
+    (let [[_ write-to-file] (output-writers options)]
+      #(write-to-file output-file :stream %))
     (make-stdout-output options)))
 
 (defn- throw-internal-error [e]
@@ -225,15 +237,60 @@
    (aggregate-authors-in-teams options)
    incanter/to-dataset))
 
+(defn- bundled-analysis-names
+  [{:keys [analyses]}]
+  (->> (string/split analyses #",")
+       (map string/trim)
+       (remove string/blank?)
+       distinct))
+
+(defn- make-bundled-analyses
+  "Returns a function that runs all analyses in the :analyses
+   option on the same data set. The result is a seq of
+   [analysis-name result] pairs."
+  [options]
+  (let [analyses (doall
+                  (for [analysis-name (bundled-analysis-names options)]
+                    [analysis-name (make-analysis (assoc options :analysis analysis-name))]))]
+    (fn [changes]
+      (mapv (fn [[analysis-name analysis]]
+              [analysis-name (analysis changes)])
+            analyses))))
+
+(defn- make-bundle-output
+  "The results of a bundle are always written as JSON since
+   CSV has no way to keep the individual tables apart."
+  [options]
+  (let [write! (if-let [n-out-rows (:rows options)]
+                 #(json-output/write-bundle-to :stream % n-out-rows)
+                 #(json-output/write-bundle-to :stream %))]
+    (if-let [output-file (:outfile options)]
+      #(with-open [out-file (io/writer output-file)]
+         (binding [*out* out-file]
+           (write! %)))
+      write!)))
+
+(defn- run-bundle
+  [logfile-name options]
+  (let [vcs-parser (parser-from options)
+        analyses (make-bundled-analyses options)
+        commits (parse-commits-to-dataset vcs-parser logfile-name options)
+        output! (make-bundle-output options)]
+    (run-with-recovery-point analyses commits output!)))
+
 (defn run
   "Runs the application using the given options.
    The options are a map with the following elements:
     :module - the VCS to parse
     :analysis - the type of analysis to run
+    :analyses - optional, a comma separated list of analyses to
+                run on a single parse of the log instead of :analysis
     :rows - the max number of results to include"
   [logfile-name options]
-  (let [vcs-parser (parser-from options)
-        commits (parse-commits-to-dataset vcs-parser logfile-name options)
-        analysis (make-analysis options)
-        output! (make-output options)]
-      (run-with-recovery-point analysis commits output!)))
+  (if (:analyses options)
+    (run-bundle logfile-name options)
+    (let [vcs-parser (parser-from options)
+          commits (parse-commits-to-dataset vcs-parser logfile-name options)
+          analysis (make-analysis options)
+          output! (make-output options)]
+      (run-with-recovery-point analysis commits output!))))
@@ -6,6 +6,7 @@
 (ns code-maat.cmd-line
   (:gen-class)
   (:require [code-maat.app.app :as app]
+            [clojure.data.json :as json]
             [clojure.string :as string]
             [clojure.tools.cli :as cli]))
 
@@ -15,9 +16,13 @@
    ["-a" "--analysis ANALYSIS"
     (str "The analysis to run (" (app/analysis-names)  ")")
     :default "authors"]
+   ["-A" "--analyses ANALYSES"
+    "A comma separated list of analyses to run on a single parse of the log. Overrides -a and always writes one JSON object keyed by analysis"]
    [nil "--input-encoding INPUT-ENCODING" "Specify an encoding other than UTF-8 for the log file"]
    ["-r" "--rows ROWS" "Max rows in output" :parse-fn #(Integer/parseInt %)]
    ["-o" "--outfile OUTFILE" "Write the result to the given file name"]
+   ["-f" "--output-format FORMAT" "The format of the result: csv or json"
+    :default "csv" :validate [#{"csv" "json"} "Must be csv or json"]]
    ["-g" "--group GROUP" "A file with a pre-defined set of layers. The data will be aggregated according to the group of layers."]
    ["-p" "--team-map-file TEAM-MAP-FILE" "A CSV file with author,team that translates individuals into teams."]
    ["-n" "--min-revs MIN-REVS" "Minimum number of revisions to include an entity in the analysis"
@@ -36,6 +41,7 @@
     "Used for coupling analyses. Instructs Code Maat to consider all commits during the rolling temporal period as a single, logical commit set"]
    ["-d" "--age-time-now AGE-TIME_NOW" "Specify a date as YYYY-MM-dd that counts as time zero when doing a code age analysis"]
    [nil  "--verbose-results" "Includes additional analysis details together with the results. Only implemented for change coupling."]
+   [nil  "--serve" "Keep running and answer requests from stdin, one JSON line each, instead of running a single analysis"]
    ["-h" "--help"]])
 
 (defn- usage [options-summary]
@@ -57,12 +63,37 @@
   (println msg)
   (System/exit status))
 
+(defn- serve-request
+  "Runs one request of the serve loop. A request is a JSON object
+   holding the command line arguments of a single run as \"args\".
+   The response carries the output the run would have printed."
+  [line]
+  (try
+    (let [{:strs [args]} (json/read-str line)
+          {:keys [options errors]} (cli/parse-opts args cli-options)]
+      (if errors
+        {"ok" false "error" (error-msg errors)}
+        {"ok" true "output" (with-out-str (app/run (:log options) options))}))
+    (catch Exception e
+      {"ok" false "error" (or (.getMessage e) (str e))})))
+
+(defn- serve
+  "Answers requests from stdin with one JSON line each until stdin
+   is closed. Keeps a single JVM alive across many analyses."
+  []
+  (doseq [line (line-seq (java.io.BufferedReader. *in*))
+          :when (not (string/blank? line))]
+    (json/write (serve-request line) *out*)
+    (newline)
+    (flush)))
+
 (defn -main
   [& args]
   (let [{:keys [options arguments errors summary]} (cli/parse-opts args cli-options)]
     (cond
      (:help options) (exit 0 (usage summary))
-     errors (exit 1 (error-msg errors)))
+     errors (exit 1 (error-msg errors))
+     (:serve options) (do (serve) (System/exit 0)))
     :else
     (try
       (app/run (:log options) options)
@@ -0,0 +1,60 @@
+;;; Copyright (C) 2013 Adam Tornhill
+;;;
+;;; Distributed under the GNU General Public License v3.0,
+;;; see http://www.gnu.org/licenses/gpl.html
+
+(ns code-maat.output.json
+  (:require [code-maat.output.filters :as filters]
+            [clojure.data.json :as json]
+            [clojure.java.io :as io]
+            [incanter.core :as incanter]))
+
+;;; An output module presenting its given Incanter dataset on JSON format:
+;;; an array with one object per row, keyed by the column names.
+;;; Numbers keep their type, which saves consumers from having to
+;;; re-infer the types from CSV text.
+
+(defn- as-json-value
+  [v]
+  (cond
+   (ratio? v) (double v)
+   (or (nil? v) (number? v) (string? v)) v
+   :else (str v)))
+
+(defn- as-rows
+  [ds]
+  (let [names (map name (incanter/col-names ds))]
+    (for [row (incanter/to-list ds)]
+      (zipmap names (map as-json-value row)))))
+
+(defn write-to
+  "Writes the given dataset ds as JSON to the given stream s.
+   By default, all rows are written. This behavior
+   is possible to override by providing a third argument
+   specifying the number of rows to write."
+  ([s ds]
+     (json/write (as-rows ds) *out*)
+     (newline))
+  ([s ds n-rows]
+     (write-to s (filters/n-rows ds n-rows))))
+
+(defn write-to-file
+  [file-name s ds]
+  (with-open [out-file (io/writer file-name)]
+    (binding [*out* out-file]
+      (write-to s ds))))
+
+(defn write-bundle-to
+  "Writes the results of several analyses as one JSON object
+   to the given stream s. The results are a seq of
+   [analysis-name dataset] pairs and the object is keyed by
+   analysis name. As with write-to, an optional third argument
+   limits the number of rows written per analysis."
+  ([s results]
+     (json/write (into {} (for [[analysis ds] results]
+                            [analysis (as-rows ds)]))
+                 *out*)
+     (newline))
+  ([s results n-rows]
+     (write-bundle-to s (for [[analysis ds] results]
+                          [analysis (filters/n-rows ds n-rows)]))))
@@ -1,6 +1,7 @@
 (ns code-maat.app.cmd-line-test
   (:require  [clojure.test :refer :all]
              [clojure.tools.cli :as cli]
+             [clojure.data.json :as json]
              [code-maat.cmd-line :refer :all]))
 
 
@@ -10,3 +11,23 @@
           parsed-options (cli/parse-opts args cli-options)]
 
       (is (nil? (:errors parsed-options))))))
+
+(defn- serve-args
+  [& args]
+  (json/write-str {"args" (vec args)}))
+
+(deftest test-serve-request
+  (testing "runs the analysis and returns its output"
+    (let [response (#'code-maat.cmd-line/serve-request
+                    (serve-args "-l" "./test/code_maat/end_to_end/simple_git2.txt"
+                                "-c" "git2" "-a" "revisions"))]
+      (is (get response "ok"))
+      (is (.startsWith (get response "output") "entity,n-revs\n"))))
+  (testing "reports errors instead of exiting"
+    (let [response (#'code-maat.cmd-line/serve-request
+                    (serve-args "-l" "./test/code_maat/end_to_end/simple_git2.txt"
+                                "-c" "git2" "-a" "no-such-analysis"))]
+      (is (false? (get response "ok")))
+      (is (.contains (get response "error") "Invalid analysis requested"))))
+  (testing "rejects malformed requests"
+    (is (false? (get (#'code-maat.cmd-line/serve-request "not json") "ok")))))
@@ -5,6 +5,7 @@
 
 (ns code-maat.end-to-end.scenario-tests
   (:require [code-maat.app.app :as app]
+            [clojure.data.json :as json]
             [code-maat.analysis.test-data :as test-data]
             [code-maat.test.data-driven :as dd])
   (:use [clojure.test]
@@ -70,6 +71,24 @@
   (is (= (run-with-str-output log-file options)
          "entity,n-authors,n-revs\n/Infrastrucure/Network/Connection.cs,2,2\n/Presentation/Status/ClientPresenter.cs,1,1\n")))
 
+(deftest analysis-with-json-output
+  (is (= (json/read-str
+          (run-with-str-output git2-log-file
+                               (assoc (git2-options "revisions") :output-format "json")))
+         [{"entity" "/Infrastrucure/Network/Connection.cs" "n-revs" 2}
+          {"entity" "/Presentation/Status/ClientPresenter.cs" "n-revs" 1}])))
+
+(deftest analysis-bundle-with-json-output
+  (is (= (json/read-str
+          (run-with-str-output git2-log-file
+                               (assoc (git2-options "authors") :analyses "revisions,coupling")))
+         {"revisions" [{"entity" "/Infrastrucure/Network/Connection.cs" "n-revs" 2}
+                       {"entity" "/Presentation/Status/ClientPresenter.cs" "n-revs" 1}]
+          "coupling" [{"entity" "/Infrastrucure/Network/Connection.cs"
+                       "coupled" "/Presentation/Status/ClientPresenter.cs"
+                       "degree" 66
+                       "average-revs" 2}]})))
+
 (def-data-driven-with-vcs-test analysis-of-revisions
   [[svn-log-file (svn-csv-options "revisions")]
    [git-log-file (git-options "revisions")]